@@ -0,0 +1,88 @@
+"""
+Per-file loops of the directory walk and pair generation.
+
+Kept in their own fully annotated module so they can be compiled with
+mypyc (``RNR_USE_MYPYC=1 pip install .``). Without a compiled build this
+module is imported as ordinary Python and behaves the same.
+"""
+
+import os
+from operator import attrgetter
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+
+def _scandir_recursive(path: str, recursive: bool = True,
+                       dir_contents: Optional[Dict[str, Set[str]]] = None,
+                       sort: bool = False) -> Iterator[Tuple[str, str, str]]:
+    """
+    Walk a directory with os.scandir, yielding the files it contains.
+    
+    The file type checks reuse the d_type reported by the directory listing,
+    so no extra stat call is made per entry. Symlinked directories are not
+    followed, matching the behaviour of Path.rglob.
+    
+    Args:
+        path: Directory to walk, as a string
+        recursive: Whether to descend into subdirectories
+        dir_contents: Optional dict to fill with the names of every entry
+            (files, directories and links) in each directory walked
+        sort: Whether to visit each directory's entries in name order,
+            descending into subdirectories where they sort. The output is
+            then ordered without buffering the whole walk
+        
+    Yields:
+        Tuples of (name, path, parent) strings for each file found. All
+        files in one directory share the same parent string object, so
+        callers never need to split a path to recover its directory.
+    """
+    subdirs: List[str] = []
+    
+    try:
+        it = os.scandir(path)
+    except OSError:
+        # Unreadable or vanished directory - skip it like rglob does
+        return
+    
+    names: Optional[Set[str]] = None
+    if dir_contents is not None:
+        names = dir_contents[path] = set()
+    
+    entries: Iterator[os.DirEntry] = it
+    if sort:
+        # Read and close the listing up front so only one directory handle
+        # is open while recursing
+        with it:
+            entries = iter(sorted(it, key=attrgetter('name')))
+    
+    try:
+        for entry in entries:
+            if names is not None:
+                names.add(entry.name)
+            # is_file/is_dir answer from d_type with no syscall. Where the
+            # filesystem reports DT_UNKNOWN, DirEntry does one lstat and caches
+            # it for both checks. entry.stat() would lstat every entry on POSIX
+            if entry.is_file():
+                yield entry.name, entry.path, path
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                if sort:
+                    yield from _scandir_recursive(entry.path, recursive, dir_contents, sort)
+                else:
+                    subdirs.append(entry.path)
+    finally:
+        it.close()
+    
+    for subdir in subdirs:
+        yield from _scandir_recursive(subdir, recursive, dir_contents)
+
+
+def _generate_pairs(walk: Iterator[Tuple[str, str, str]],
+                    rename: Callable[[str], str]) -> Iterator[Tuple[str, str]]:
+    """Yield (old_path, new_path) for each walked file whose name changes."""
+    join = os.path.join
+
+    for name, path, parent in walk:
+        # A per-name str.replace is as fast as one replace (or re.sub) over
+        # all names joined into a single buffer, and keeps the walk streaming
+        new_name = rename(name)
+        if new_name != name:
+            yield path, join(parent, new_name)
@@ -0,0 +1,113 @@
+"""
+Optional C backend for batched renames on Linux.
+
+Wraps the ``rnr._renameat`` extension, which is built from _renameat.c on
+Linux when a C compiler is available. It renames a whole batch in one call
+with the GIL released. When the extension is not built, rename_batch
+returns None and the caller falls back to rename_noreplace.
+
+Both refuse to replace an existing target, using renameat2 with
+RENAME_NOREPLACE, so a file created after the conflict check is reported
+as FileExistsError instead of being overwritten.
+"""
+
+import ctypes
+import errno
+import os
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from . import _renameat
+except ImportError:
+    _renameat = None
+
+# From <fcntl.h> and <linux/fs.h>
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1
+
+
+def _load_renameat2():
+    """Bind libc's renameat2, or return None where it is not available."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        func = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        # glibc before 2.28, or a libc without the wrapper
+        return None
+    func.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint)
+    func.restype = ctypes.c_int
+    return func
+
+
+_renameat2 = _load_renameat2()
+
+
+def same_file(old_path, new_path) -> bool:
+    """
+    Whether both paths name the same file, without following symlinks.
+
+    RENAME_NOREPLACE fails with EEXIST when the target is the source
+    itself, for example an identity pair or a case-only rename on a
+    case-insensitive filesystem. os.rename handles those as before.
+    """
+    try:
+        return os.path.samestat(os.lstat(old_path), os.lstat(new_path))
+    except OSError:
+        return False
+
+
+def rename_noreplace(old_path, new_path) -> None:
+    """
+    Rename old_path to new_path, failing if new_path already exists.
+
+    The existence check and the rename are one renameat2 call, so there
+    is no window for another process to create the target in between.
+    Where the kernel or filesystem does not support RENAME_NOREPLACE this
+    falls back to os.rename, and the caller's own conflict check is all
+    that protects the target. A target that is the source file itself
+    is not a conflict; that rename is left to os.rename, as before.
+
+    Raises:
+        FileExistsError: new_path exists and is a different file
+        OSError: Any other rename failure, as raised by os.rename
+    """
+    if _renameat2 is not None:
+        fsencode = os.fsencode
+        if _renameat2(AT_FDCWD, fsencode(old_path), AT_FDCWD, fsencode(new_path),
+                      RENAME_NOREPLACE) == 0:
+            return
+        code = ctypes.get_errno()
+        if code == errno.EEXIST:
+            if not same_file(old_path, new_path):
+                raise OSError(code, os.strerror(code), old_path, None, new_path)
+        elif code not in (errno.EINVAL, errno.ENOSYS):
+            raise OSError(code, os.strerror(code), old_path, None, new_path)
+    os.rename(old_path, new_path)
+
+
+def rename_batch(rename_pairs: Sequence[Tuple[str, str]]) -> Optional[List[Optional[OSError]]]:
+    """
+    Rename every pair through the C extension, in order.
+
+    Args:
+        rename_pairs: Sequence of (old_path, new_path) tuples, as strings or Path objects
+
+    Returns:
+        List with one entry per pair - None on success, the OSError on
+        failure - or None if the extension cannot be used and nothing was renamed
+    """
+    if _renameat is None or not sys.platform.startswith('linux') or not rename_pairs:
+        return None
+
+    fsencode = os.fsencode
+    codes = _renameat.batch_rename([(fsencode(old), fsencode(new)) for old, new in rename_pairs])
+
+    errors: List[Optional[OSError]] = [None] * len(codes)
+    for index, code in enumerate(codes):
+        if code:
+            old, new = rename_pairs[index]
+            # Same exception (and subclass) os.rename would have raised
+            errors[index] = OSError(code, os.strerror(code), old, None, new)
+    return errors
@@ -0,0 +1,123 @@
+/*
+ * Batched renameat(2) for rnr, built as an optional extension on Linux.
+ *
+ * batch_rename(pairs) takes a sequence of (old, new) bytes tuples, renames
+ * them in order with the GIL released, and returns a list holding 0 for
+ * each success and the errno for each failure. Existing targets are never
+ * replaced: where RENAME_NOREPLACE is supported they fail with EEXIST,
+ * unless the target is the source file itself.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <errno.h>
+#include <fcntl.h>
+#include <stdio.h>
+#include <sys/stat.h>
+
+/* Whether both paths are the same file, without following symlinks */
+static int
+same_file(const char *old, const char *new)
+{
+    struct stat old_st, new_st;
+
+    if (lstat(old, &old_st) != 0 || lstat(new, &new_st) != 0)
+        return 0;
+    return old_st.st_dev == new_st.st_dev && old_st.st_ino == new_st.st_ino;
+}
+
+static int
+rename_noreplace(const char *old, const char *new)
+{
+#ifdef RENAME_NOREPLACE
+    if (renameat2(AT_FDCWD, old, AT_FDCWD, new, RENAME_NOREPLACE) == 0)
+        return 0;
+    /* A target that is the source itself is not a conflict */
+    if (errno == EEXIST) {
+        if (!same_file(old, new))
+            return EEXIST;
+    }
+    /* Kernel or filesystem without RENAME_NOREPLACE: plain rename */
+    else if (errno != EINVAL && errno != ENOSYS)
+        return errno;
+#endif
+    return renameat(AT_FDCWD, old, AT_FDCWD, new) == 0 ? 0 : errno;
+}
+
+static PyObject *
+batch_rename(PyObject *self, PyObject *arg)
+{
+    PyObject *pairs, *result = NULL;
+    const char **paths = NULL;
+    int *errors = NULL;
+    Py_ssize_t n, i;
+
+    /* Our own list, so the bytes objects outlive the GIL-free loop */
+    pairs = PySequence_List(arg);
+    if (pairs == NULL)
+        return NULL;
+    n = PyList_GET_SIZE(pairs);
+
+    paths = PyMem_New(const char *, 2 * n + 1);
+    errors = PyMem_New(int, n + 1);
+    if (paths == NULL || errors == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+
+    for (i = 0; i < n; i++) {
+        PyObject *pair = PyList_GET_ITEM(pairs, i);
+        if (!PyTuple_Check(pair) || PyTuple_GET_SIZE(pair) != 2
+                || !PyBytes_Check(PyTuple_GET_ITEM(pair, 0))
+                || !PyBytes_Check(PyTuple_GET_ITEM(pair, 1))) {
+            PyErr_SetString(PyExc_TypeError, "pairs must be (bytes, bytes) tuples");
+            goto done;
+        }
+        paths[2 * i] = PyBytes_AS_STRING(PyTuple_GET_ITEM(pair, 0));
+        paths[2 * i + 1] = PyBytes_AS_STRING(PyTuple_GET_ITEM(pair, 1));
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 0; i < n; i++)
+        errors[i] = rename_noreplace(paths[2 * i], paths[2 * i + 1]);
+    Py_END_ALLOW_THREADS
+
+    result = PyList_New(n);
+    if (result == NULL)
+        goto done;
+    for (i = 0; i < n; i++) {
+        PyObject *code = PyLong_FromLong(errors[i]);
+        if (code == NULL) {
+            Py_CLEAR(result);
+            goto done;
+        }
+        PyList_SET_ITEM(result, i, code);
+    }
+
+done:
+    PyMem_Free(paths);
+    PyMem_Free(errors);
+    Py_DECREF(pairs);
+    return result;
+}
+
+static PyMethodDef renameat_methods[] = {
+    {"batch_rename", batch_rename, METH_O,
+     "Rename (old, new) bytes pairs without replacing; return 0 or the errno for each."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef renameat_module = {
+    PyModuleDef_HEAD_INIT,
+    "rnr._renameat",
+    "Batched renameat(2) with the GIL released.",
+    -1,
+    renameat_methods
+};
+
+PyMODINIT_FUNC
+PyInit__renameat(void)
+{
+    return PyModule_Create(&renameat_module);
+}
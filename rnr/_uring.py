@@ -0,0 +1,104 @@
+"""
+Optional io_uring backend for batched renames on Linux.
+
+Uses the third-party ``liburing`` bindings (``pip install rnr[uring]``).
+When they are not installed, or the kernel refuses to set up a ring,
+rename_batch returns None and the caller falls back to os.rename.
+Renames are submitted with RENAME_NOREPLACE, so existing targets fail
+with FileExistsError instead of being replaced.
+"""
+
+import errno
+import os
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+from ._native import rename_noreplace, same_file
+
+# Number of rename SQEs submitted per io_uring_enter call. Throughput is
+# flat from 16 to 256, and smaller batches keep completion latency down
+BATCH_SIZE = 32
+
+# From <linux/fs.h>
+RENAME_NOREPLACE = 1
+
+
+def _encodable(path: str) -> bool:
+    """The bindings only take str paths that encode cleanly as UTF-8."""
+    try:
+        path.encode('utf-8')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def rename_batch(rename_pairs: Sequence[Tuple[str, str]]) -> Optional[List[Optional[OSError]]]:
+    """
+    Rename every pair through io_uring.
+
+    Args:
+        rename_pairs: Sequence of (old_path, new_path) tuples, as strings or Path objects
+
+    Returns:
+        List with one entry per pair - None on success, the OSError on
+        failure - or None if io_uring cannot be used and nothing was renamed
+    """
+    if liburing is None or not sys.platform.startswith('linux') or not rename_pairs:
+        return None
+
+    pairs = [(os.fspath(old), os.fspath(new)) for old, new in rename_pairs]
+    if not all(_encodable(old) and _encodable(new) for old, new in pairs):
+        return None
+
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    try:
+        liburing.io_uring_queue_init(min(len(pairs), BATCH_SIZE), ring)
+    except OSError:
+        # Kernel too old, io_uring disabled by sysctl or seccomp, ...
+        return None
+
+    errors: List[Optional[OSError]] = [None] * len(pairs)
+    try:
+        for start in range(0, len(pairs), BATCH_SIZE):
+            chunk = pairs[start:start + BATCH_SIZE]
+            for index, (old, new) in enumerate(chunk, start):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_rename(sqe, old, new, RENAME_NOREPLACE)
+                sqe.user_data = index
+            liburing.io_uring_submit_and_wait(ring, len(chunk))
+
+            for _ in chunk:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                index = entry.user_data
+                try:
+                    # Reading res raises the OSError for a negative result
+                    entry.res
+                except OSError as e:
+                    old, new = pairs[index]
+                    if e.errno == errno.EINVAL or (e.errno == errno.EEXIST
+                                                   and same_file(old, new)):
+                        # EINVAL may only mean the kernel has no IORING_OP_RENAMEAT
+                        # (before 5.11), so retry through renameat2 rather than
+                        # a plain rename. That still refuses to replace a target,
+                        # and itself falls back for filesystems without the flag
+                        # and for a target that is the source itself
+                        try:
+                            rename_noreplace(old, new)
+                        except OSError as retry_error:
+                            errors[index] = retry_error
+                    else:
+                        e.filename = old
+                        e.filename2 = new
+                        errors[index] = e
+                liburing.io_uring_cqe_seen(ring, entry)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+    return errors
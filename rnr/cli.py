@@ -3,35 +3,68 @@
 CLI interface for rnr - Recursive file renaming tool
 """
 
+import os
+import stat
 import sys
 import argparse
-from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
-from .core import find_files, generate_rename_pairs, check_conflicts, apply_renames
-from .colors import Colors
+from .core import iter_rename_pairs, check_conflicts, apply_renames
+from .colors import get_colors
 
 
-def preview_changes(rename_pairs: List[Tuple[Path, Path]]):
-    """Display preview of changes"""
-    if not rename_pairs:
-        print(f"{Colors.YELLOW}No files match the pattern.{Colors.RESET}")
-        return
-    
-    print(f"\n{Colors.BOLD}Preview of changes:{Colors.RESET}")
-    print(f"{Colors.BLUE}{'─' * 80}{Colors.RESET}\n")
+# Number of preview entries buffered between writes
+PREVIEW_CHUNK = 256
+
+
+def preview_changes(rename_pairs: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Display preview of changes.
+    
+    Pairs are shown as they are produced, so a lazy iterator gives output
+    straight away on large trees. Returns the pairs that were shown.
+    """
+    C = get_colors()
+    basename = os.path.basename
+    dirname = os.path.dirname
+    write = sys.stdout.write
+    shown = []
+    # Write in chunks rather than printing each line
+    parts = []
     
     for old_path, new_path in rename_pairs:
-        print(f"{Colors.RED}{old_path.name}{Colors.RESET}")
-        print(f"  → {Colors.GREEN}{new_path.name}{Colors.RESET}")
-        print(f"  {Colors.BLUE}{old_path.parent}{Colors.RESET}\n")
-    
-    print(f"{Colors.BOLD}Total files to rename: {len(rename_pairs)}{Colors.RESET}")
+        if not shown:
+            parts.append(f"\n{C.BOLD}Preview of changes:{C.RESET}\n")
+            parts.append(f"{C.BLUE}{'─' * 80}{C.RESET}\n\n")
+        shown.append((old_path, new_path))
+        parts.append(
+            f"{C.RED}{basename(old_path)}{C.RESET}\n"
+            f"  → {C.GREEN}{basename(new_path)}{C.RESET}\n"
+            f"  {C.BLUE}{dirname(old_path)}{C.RESET}\n\n"
+        )
+        if len(parts) >= PREVIEW_CHUNK:
+            write(''.join(parts))
+            parts.clear()
+    
+    if not shown:
+        print(f"{C.YELLOW}No files match the pattern.{C.RESET}")
+        return shown
+    
+    parts.append(f"{C.BOLD}Total files to rename: {len(shown)}{C.RESET}\n")
+    write(''.join(parts))
+    return shown
 
 
-def main():
-    """Main CLI entry point"""
+def main(argv: List[str] = None):
+    """
+    Main CLI entry point.
+    
+    Args:
+        argv: Command line arguments, without the program name (default
+            sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
+        prog='rnr',
         description='rnr - Recursively rename files by pattern matching',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -47,18 +80,23 @@ Examples:
   
   # Remove pattern from filenames
   rnr --find "_backup" --replace ""
+  
+  # Apply several replacements in one pass
+  rnr --find " " --replace "_" --find "-" --replace "_"
         """
     )
     
     parser.add_argument(
         '--find', '-f',
         required=True,
-        help='Pattern to find in filenames'
+        action='append',
+        help='Pattern to find in filenames (repeat with --replace for several rules)'
     )
     
     parser.add_argument(
         '--replace', '-r',
         required=True,
+        action='append',
         help='Replacement string (use empty string "" to remove)'
     )
     
@@ -92,65 +130,92 @@ Examples:
         help='Show detailed output during renaming'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Number of threads for large rename batches '
+             '(default: automatic; 1 renames files one at a time)'
+    )
     
-    # Validate path
-    root_path = Path(args.path).resolve()
-    if not root_path.exists():
-        print(f"{Colors.RED}Error: Path '{args.path}' does not exist{Colors.RESET}")
+    args = parser.parse_args(argv)
+    C = get_colors()
+    
+    if len(args.find) != len(args.replace):
+        parser.error("each --find needs a matching --replace")
+    if not all(args.find):
+        parser.error("argument --find/-f: must not be empty")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("argument --jobs/-j: must be at least 1")
+    rules = list(zip(args.find, args.replace))
+    
+    # Validate path. abspath is purely lexical, so this is one stat call
+    # instead of the per-component lstats Path.resolve makes
+    root_path = os.path.abspath(args.path)
+    try:
+        root_stat = os.stat(root_path)
+    except (FileNotFoundError, NotADirectoryError):
+        print(f"{C.RED}Error: Path '{args.path}' does not exist{C.RESET}")
+        sys.exit(1)
+    except OSError as e:
+        # Permission denied, a symlink loop, ...
+        print(f"{C.RED}Error: Path '{args.path}' cannot be accessed: {e.strerror}{C.RESET}")
         sys.exit(1)
     
-    if not root_path.is_dir():
-        print(f"{Colors.RED}Error: Path '{args.path}' is not a directory{Colors.RESET}")
+    if not stat.S_ISDIR(root_stat.st_mode):
+        print(f"{C.RED}Error: Path '{args.path}' is not a directory{C.RESET}")
         sys.exit(1)
     
-    # Find files
-    print(f"Searching for files in {Colors.BLUE}{root_path}{Colors.RESET}...")
+    # Find files and generate rename pairs
+    print(f"Searching for files in {C.BLUE}{root_path}{C.RESET}...")
     recursive = not args.no_recursive
-    files = find_files(root_path, args.find, recursive)
-    
-    # Generate rename pairs
-    rename_pairs = generate_rename_pairs(files, args.find, args.replace)
+    dir_contents = {}
+    # Sorting is only for the preview; the renames themselves don't need it
+    pairs = iter_rename_pairs(root_path, rules, recursive, dir_contents, sort=True)
     
-    # Preview changes
-    preview_changes(rename_pairs)
+    # Preview changes as they are found. Only the matching pairs are kept,
+    # as strings, for the conflict check and the renames
+    rename_pairs = preview_changes(pairs)
     
     if not rename_pairs:
         sys.exit(0)
     
     # Check for conflicts
-    conflicts = check_conflicts(rename_pairs)
+    conflicts = check_conflicts(rename_pairs, dir_contents)
     if conflicts:
-        print(f"\n{Colors.RED}{Colors.BOLD}Warning: Found {len(conflicts)} naming conflicts:{Colors.RESET}")
+        print(f"\n{C.RED}{C.BOLD}Warning: Found {len(conflicts)} naming conflicts:{C.RESET}")
         for old_path, new_path in conflicts[:5]:  # Show first 5
-            print(f"  {Colors.RED}✗{Colors.RESET} {new_path.name} already exists or would be duplicated")
+            print(f"  {C.RED}✗{C.RESET} {os.path.basename(new_path)} "
+                  f"already exists or would be duplicated")
         if len(conflicts) > 5:
             print(f"  ... and {len(conflicts) - 5} more")
-        print(f"\n{Colors.YELLOW}Please resolve conflicts before proceeding.{Colors.RESET}")
+        print(f"\n{C.YELLOW}Please resolve conflicts before proceeding.{C.RESET}")
         sys.exit(1)
     
     # Exit if dry-run
     if args.dry_run:
-        print(f"\n{Colors.YELLOW}Dry-run mode: No changes were made.{Colors.RESET}")
+        print(f"\n{C.YELLOW}Dry-run mode: No changes were made.{C.RESET}")
         sys.exit(0)
     
     # Confirm before applying
     if not args.yes:
-        print(f"\n{Colors.YELLOW}Apply these changes? [y/N]{Colors.RESET} ", end='')
+        print(f"\n{C.YELLOW}Apply these changes? [y/N]{C.RESET} ", end='')
         response = input().strip().lower()
         if response not in ('y', 'yes'):
             print("Cancelled.")
             sys.exit(0)
     
     # Apply renames
-    print(f"\n{Colors.BOLD}Applying changes...{Colors.RESET}")
-    success_count, error_count = apply_renames(rename_pairs, args.verbose)
+    print(f"\n{C.BOLD}Applying changes...{C.RESET}")
+    # The conflict check above rejects every target that already exists,
+    # so no pair depends on another and the renames may run in any order
+    success_count, error_count = apply_renames(rename_pairs, args.verbose, args.jobs)
     
     # Summary
-    print(f"\n{Colors.BOLD}Summary:{Colors.RESET}")
-    print(f"  {Colors.GREEN}✓{Colors.RESET} Successfully renamed: {success_count}")
+    print(f"\n{C.BOLD}Summary:{C.RESET}")
+    print(f"  {C.GREEN}✓{C.RESET} Successfully renamed: {success_count}")
     if error_count > 0:
-        print(f"  {Colors.RED}✗{Colors.RESET} Failed: {error_count}")
+        print(f"  {C.RED}✗{C.RESET} Failed: {error_count}")
     
     sys.exit(0 if error_count == 0 else 1)
 
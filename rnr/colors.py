@@ -2,6 +2,8 @@
 ANSI color codes for terminal output
 """
 
+import sys
+
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -10,4 +12,25 @@ class Colors:
     YELLOW = '\033[93m'
     RED = '\033[91m'
     RESET = '\033[0m'
-    BOLD = '\033[1m'
\ No newline at end of file
+    BOLD = '\033[1m'
+
+
+class NoColors:
+    """Drop-in replacement for Colors that emits no escape codes"""
+    BLUE = ''
+    GREEN = ''
+    YELLOW = ''
+    RED = ''
+    RESET = ''
+    BOLD = ''
+
+
+def get_colors(stream=None):
+    """Return Colors if stream (default stdout) is a terminal, else NoColors"""
+    if stream is None:
+        stream = sys.stdout
+    try:
+        is_tty = stream.isatty()
+    except (AttributeError, ValueError):
+        is_tty = False
+    return Colors if is_tty else NoColors
\ No newline at end of file
@@ -2,42 +2,138 @@
 Core functionality for rnr - file discovery and renaming logic
 """
 
+import os
+import re
+import sys
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
-def find_files(root_path: Path, pattern: str = None, recursive: bool = True) -> List[Path]:
+from ._core_hot import _generate_pairs, _scandir_recursive
+
+# Number of distinct find patterns from which compile_rules uses the
+# Aho-Corasick automaton; below it the regex alternation is faster
+AHOCORASICK_MIN_RULES = 32
+
+# Number of renames above which apply_renames switches to a thread pool
+PARALLEL_THRESHOLD = 64
+
+# Number of verbose/error lines apply_renames buffers before writing
+OUTPUT_CHUNK_LINES = 1024
+
+# Number of pairs apply_renames pulls from its input at a time
+APPLY_BATCH_SIZE = 4096
+
+
+def find_paths(root_path: str, pattern: str = None, recursive: bool = True,
+               sort: bool = False) -> List[str]:
+    """
+    Find all files in the given path, as plain path strings.
+    
+    Args:
+        root_path: Root directory to search
+        pattern: Optional pattern to filter filenames
+        recursive: Whether to search recursively
+        sort: Whether to return files in sorted order (each directory's
+            entries by name, depth first); otherwise they are returned in
+            directory walk order
+        
+    Returns:
+        List of path strings for matching files
+    """
+    paths = []
+    
+    for name, path, _parent in _scandir_recursive(os.fspath(root_path), recursive, sort=sort):
+        if pattern is None or pattern in name:
+            paths.append(path)
+    
+    return paths
+
+
+def find_files(root_path: Path, pattern: str = None, recursive: bool = True,
+               sort: bool = False) -> List[Path]:
     """
     Find all files in the given path.
     
+    Path-based wrapper around find_paths.
+    
     Args:
         root_path: Root directory to search
         pattern: Optional pattern to filter filenames
         recursive: Whether to search recursively
+        sort: Whether to return files in sorted order (see find_paths)
         
     Returns:
         List of Path objects for matching files
     """
-    files = []
+    return [Path(path) for path in find_paths(root_path, pattern, recursive, sort)]
+
+
+def generate_path_pairs(paths: List[str], find: str, replace: str) -> List[Tuple[str, str]]:
+    """
+    Generate old and new path string pairs for renaming.
     
-    if recursive:
-        for item in root_path.rglob('*'):
-            if item.is_file():
-                if pattern is None or pattern in item.name:
-                    files.append(item)
-    else:
-        for item in root_path.glob('*'):
-            if item.is_file():
-                if pattern is None or pattern in item.name:
-                    files.append(item)
+    Args:
+        paths: List of file path strings to process
+        find: Pattern to find in filenames
+        replace: Replacement string
+        
+    Returns:
+        List of tuples (old_path, new_path) for files that will be renamed
+        
+    Raises:
+        ValueError: If find is empty
+    """
+    return generate_path_pairs_rules(paths, [(find, replace)])
+
+
+def generate_path_pairs_rules(paths: List[str],
+                              rules: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Like generate_path_pairs, but applies several (find, replace) rules at once.
+    
+    See compile_rules for how overlapping patterns are resolved.
+    
+    Args:
+        paths: List of file path strings to process
+        rules: List of (find, replace) tuples
+        
+    Returns:
+        List of tuples (old_path, new_path) for files that will be renamed
+        
+    Raises:
+        ValueError: If rules is empty or any find pattern is empty
+    """
+    rename = compile_rules(rules)
+    rename_pairs = []
+    basename = os.path.basename
+    dirname = os.path.dirname
+    join = os.path.join
+    
+    for path in paths:
+        old_name = basename(path)
+        new_name = rename(old_name)
+        
+        # Only include if the name actually changes; most names don't, so
+        # the directory part is only split off for the ones that do
+        if old_name != new_name:
+            rename_pairs.append((path, join(dirname(path), new_name)))
     
-    return sorted(files)
+    return rename_pairs
 
 
 def generate_rename_pairs(files: List[Path], find: str, replace: str) -> List[Tuple[Path, Path]]:
     """
     Generate old and new path pairs for renaming.
     
+    Path-based wrapper around generate_path_pairs.
+    
     Args:
         files: List of file paths to process
         find: Pattern to find in filenames
@@ -45,71 +141,341 @@ def generate_rename_pairs(files: List[Path], find: str, replace: str) -> List[Tu
         
     Returns:
         List of tuples (old_path, new_path) for files that will be renamed
+        
+    Raises:
+        ValueError: If find is empty
     """
-    rename_pairs = []
+    pairs = generate_path_pairs([os.fspath(file_path) for file_path in files], find, replace)
+    return [(Path(old_path), Path(new_path)) for old_path, new_path in pairs]
+
+
+def compile_rules(rules: List[Tuple[str, str]]) -> Callable[[str], str]:
+    """
+    Build a function that applies several find/replace rules to a name.
+    
+    All patterns are matched in one left-to-right pass over the original
+    name. Where matches overlap, the longest one starting furthest left
+    wins, and replacement text is never re-scanned. With a single rule
+    this is exactly str.replace.
     
-    for file_path in files:
-        old_name = file_path.name
-        new_name = old_name.replace(find, replace)
+    Multiple rules use a regex alternation, or an Aho-Corasick automaton
+    for AHOCORASICK_MIN_RULES or more patterns when the optional
+    pyahocorasick package is installed; both give the same results.
+    
+    Args:
+        rules: List of (find, replace) tuples
         
-        # Only include if the name actually changes
-        if old_name != new_name:
-            new_path = file_path.parent / new_name
-            rename_pairs.append((file_path, new_path))
+    Returns:
+        Function mapping an old name to its new name
+        
+    Raises:
+        ValueError: If rules is empty or any find pattern is empty
+    """
+    if not rules:
+        raise ValueError("at least one find pattern is required")
+    if not all(find for find, _replace in rules):
+        raise ValueError("find pattern must not be empty")
     
-    return rename_pairs
+    if len(rules) == 1:
+        find, replace = rules[0]
+        
+        # No special case for one-character patterns: str.replace already
+        # has an in-place path for them, and encoding the name to bytes for
+        # bytes.translate costs more than it saves (and breaks on non-ASCII)
+        def replace_one(name: str) -> str:
+            if find not in name:
+                return name
+            return name.replace(find, replace)
+        
+        return replace_one
+    
+    # The first rule wins if the same pattern is given twice
+    mapping = {}
+    for find, replace in rules:
+        mapping.setdefault(find, replace)
+    
+    if ahocorasick is not None and len(mapping) >= AHOCORASICK_MIN_RULES:
+        automaton = ahocorasick.Automaton()
+        for find, replace in mapping.items():
+            automaton.add_word(find, (len(find), replace))
+        automaton.make_automaton()
+        
+        def replace_many(name: str) -> str:
+            # Leftmost start first, then longest match
+            matches = sorted((end - length + 1, -length, replace)
+                             for end, (length, replace) in automaton.iter(name))
+            if not matches:
+                return name
+            parts = []
+            pos = 0
+            for start, neg_length, replace in matches:
+                if start < pos:
+                    continue
+                parts.append(name[pos:start])
+                parts.append(replace)
+                pos = start - neg_length
+            parts.append(name[pos:])
+            return ''.join(parts)
+        
+        return replace_many
+    
+    # Longest alternatives first so the regex picks the longest match
+    alternatives = sorted(mapping, key=len, reverse=True)
+    pattern = re.compile('|'.join(re.escape(find) for find in alternatives))
+    
+    def replace_many(name: str) -> str:
+        return pattern.sub(lambda m: mapping[m.group()], name)
+    
+    return replace_many
+
+
+def find_and_pair(root_path: str, find: str, replace: str, recursive: bool = True,
+                  dir_contents: Dict[str, Set[str]] = None,
+                  sort: bool = False) -> List[Tuple[str, str]]:
+    """
+    Find matching files and generate their rename pairs in a single pass.
+
+    Equivalent to generate_rename_pairs(find_files(root_path, find, recursive), ...)
+    but works on the raw strings from the directory walk, so no intermediate
+    list of Path objects is built.
+
+    Args:
+        root_path: Root directory to search
+        find: Pattern to find in filenames
+        replace: Replacement string
+        recursive: Whether to search recursively
+        dir_contents: Optional dict to fill with the entry names of every
+            directory walked, for use by check_conflicts
+        sort: Whether to return pairs in sorted order (see find_paths)
+
+    Returns:
+        List of tuples (old_path, new_path) as strings
+
+    Raises:
+        ValueError: If find is empty
+    """
+    return find_and_pair_rules(root_path, [(find, replace)], recursive, dir_contents, sort)
+
+
+def find_and_pair_rules(root_path: str, rules: List[Tuple[str, str]], recursive: bool = True,
+                        dir_contents: Dict[str, Set[str]] = None,
+                        sort: bool = False) -> List[Tuple[str, str]]:
+    """
+    Like find_and_pair, but applies several (find, replace) rules at once.
+
+    See compile_rules for how overlapping patterns are resolved.
+
+    Args:
+        root_path: Root directory to search
+        rules: List of (find, replace) tuples
+        recursive: Whether to search recursively
+        dir_contents: Optional dict to fill with the entry names of every
+            directory walked, for use by check_conflicts
+        sort: Whether to return pairs in sorted order (see find_paths)
+
+    Returns:
+        List of tuples (old_path, new_path) as strings
+
+    Raises:
+        ValueError: If rules is empty or any find pattern is empty
+    """
+    return list(iter_rename_pairs(root_path, rules, recursive, dir_contents, sort))
+
+
+def iter_rename_pairs(root_path: str, rules: List[Tuple[str, str]], recursive: bool = True,
+                      dir_contents: Dict[str, Set[str]] = None,
+                      sort: bool = False) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily generate rename pairs while the directory tree is walked.
+
+    Nothing is buffered beyond the directory being listed, so pairs can be
+    previewed or renamed as soon as they are found. dir_contents is only
+    complete once the iterator is exhausted.
+
+    Args:
+        root_path: Root directory to search
+        rules: List of (find, replace) tuples
+        recursive: Whether to search recursively
+        dir_contents: Optional dict to fill with the entry names of every
+            directory walked, for use by check_conflicts
+        sort: Whether to yield pairs in sorted order (see find_paths)
+
+    Returns:
+        Iterator of (old_path, new_path) string tuples
+
+    Raises:
+        ValueError: If rules is empty or any find pattern is empty, raised
+            immediately rather than on first iteration
+    """
+    rename = compile_rules(rules)
+    walk = _scandir_recursive(os.fspath(root_path), recursive, dir_contents, sort)
+    return _generate_pairs(walk, rename)
+
+
+def _fold(name: str) -> str:
+    """Key under which case- or normalization-insensitive filesystems match names."""
+    import unicodedata
+    return unicodedata.normalize('NFC', name).casefold()
 
 
-def check_conflicts(rename_pairs: List[Tuple[Path, Path]]) -> List[Tuple[Path, Path]]:
+def _path_exists(path: str, dir_contents: Dict[str, Set[str]] = None,
+                 folded: Dict[str, Set[str]] = None) -> bool:
+    """
+    Check whether a path exists without following a final symlink.
+    
+    Directories already listed in dir_contents are answered from memory.
+    A name in the listing exists; a name missing from it only counts as
+    missing when no listed name differs from it by case or Unicode
+    normalization alone. Otherwise, on a case-insensitive filesystem
+    such as the macOS and Windows defaults, the target may be an existing
+    file under another spelling, so the filesystem decides with a single
+    os.lstat. folded caches the folded listings between calls.
+    """
+    if dir_contents is not None:
+        parent, name = os.path.split(path)
+        names = dir_contents.get(parent)
+        if names is not None:
+            if name in names:
+                return True
+            if folded is None:
+                folded = {}
+            folded_names = folded.get(parent)
+            if folded_names is None:
+                folded_names = folded[parent] = {_fold(entry) for entry in names}
+            if _fold(name) not in folded_names:
+                return False
+    
+    try:
+        os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    return True
+
+
+def check_conflicts(rename_pairs: List[Tuple[str, str]],
+                    dir_contents: Dict[str, Set[str]] = None) -> List[Tuple[str, str]]:
     """
     Check for naming conflicts in rename operations.
     
     Args:
-        rename_pairs: List of (old_path, new_path) tuples
+        rename_pairs: List of (old_path, new_path) tuples, as strings or Path objects
+        dir_contents: Optional directory listings gathered by find_and_pair,
+            used to answer existence checks without a syscall
         
     Returns:
         List of conflicting pairs
     """
     conflicts = []
     new_paths = set()
+    fspath = os.fspath
+    folded = {}
     
     for old_path, new_path in rename_pairs:
+        # String pairs are used as-is; Path pairs are stringified once
+        key = fspath(new_path)
         # Check if target already exists
-        if new_path.exists() and new_path != old_path:
+        if new_path != old_path and _path_exists(key, dir_contents, folded):
             conflicts.append((old_path, new_path))
         # Check for duplicate target names in this operation
-        elif str(new_path) in new_paths:
+        elif key in new_paths:
             conflicts.append((old_path, new_path))
         else:
-            new_paths.add(str(new_path))
+            new_paths.add(key)
     
     return conflicts
 
 
-def apply_renames(rename_pairs: List[Tuple[Path, Path]], verbose: bool = False) -> Tuple[int, int]:
+def _do_rename(pair: Tuple[str, str]) -> Optional[Exception]:
+    """Rename one pair without replacing, returning the exception instead of raising it."""
+    # Imported here so that loading rnr does not pull in ctypes
+    from . import _native
+    try:
+        _native.rename_noreplace(pair[0], pair[1])
+    except Exception as e:
+        return e
+    return None
+
+
+def apply_renames(rename_pairs: Iterable[Tuple[str, str]], verbose: bool = False,
+                  jobs: Optional[int] = 1) -> Tuple[int, int]:
     """
     Apply the rename operations.
     
+    Pairs are consumed lazily, APPLY_BATCH_SIZE at a time. By default they
+    are renamed in order (through the _renameat C extension when built),
+    so chained pairs such as a → b, b → c work. jobs=None lets large
+    batches go through io_uring or a thread pool, and jobs > 1 forces a
+    pool of that size; both may rename out of order, so only use them for
+    independent pairs, such as ones that passed check_conflicts. On Linux
+    no backend replaces an existing target; that is reported as a conflict.
+    
     Args:
-        rename_pairs: List of (old_path, new_path) tuples
+        rename_pairs: Iterable of (old_path, new_path) tuples, as strings or Path objects
         verbose: Whether to print detailed output
+        jobs: Number of rename threads (1 renames in order), or None to
+            choose automatically
         
     Returns:
         Tuple of (success_count, error_count)
     """
-    from .colors import Colors
+    from . import _native
+    from .colors import get_colors
+    C = get_colors()
     
     success_count = 0
     error_count = 0
+    basename = os.path.basename
+    # Output is flushed in chunks instead of one print per file
+    lines = []
+    write = sys.stdout.write
+    pairs = iter(rename_pairs)
+    executor = None
     
-    for old_path, new_path in rename_pairs:
-        try:
-            old_path.rename(new_path)
-            success_count += 1
-            if verbose:
-                print(f"{Colors.GREEN}✓{Colors.RESET} {old_path.name} → {new_path.name}")
-        except Exception as e:
-            error_count += 1
-            print(f"{Colors.RED}✗{Colors.RESET} Failed to rename {old_path.name}: {e}")
+    with ExitStack() as stack:
+        while True:
+            batch = list(islice(pairs, APPLY_BATCH_SIZE))
+            if not batch:
+                break
+            
+            results = None
+            if len(batch) > PARALLEL_THRESHOLD and jobs != 1:
+                # Prefer a single io_uring batch, then the C loop, then a thread pool
+                if jobs is None:
+                    from . import _uring
+                    results = _uring.rename_batch(batch)
+                    if results is None:
+                        results = _native.rename_batch(batch)
+                if results is None:
+                    if executor is None:
+                        from concurrent.futures import ThreadPoolExecutor
+                        workers = jobs or min(32, (os.cpu_count() or 1) * 4)
+                        executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+                    results = executor.map(_do_rename, batch)
+            else:
+                # Small batches are not worth the thread start-up cost
+                results = _native.rename_batch(batch)
+                if results is None:
+                    results = map(_do_rename, batch)
+            
+            for (old_path, new_path), error in zip(batch, results):
+                if error is None:
+                    success_count += 1
+                    if verbose:
+                        lines.append(f"{C.GREEN}✓{C.RESET} {basename(old_path)} → "
+                                     f"{basename(new_path)}\n")
+                elif isinstance(error, FileExistsError):
+                    error_count += 1
+                    lines.append(f"{C.RED}✗{C.RESET} Not renaming {basename(old_path)}: "
+                                 f"conflict, {basename(new_path)} already exists\n")
+                else:
+                    error_count += 1
+                    lines.append(f"{C.RED}✗{C.RESET} Failed to rename {basename(old_path)}: "
+                                 f"{error}\n")
+                if len(lines) >= OUTPUT_CHUNK_LINES:
+                    write(''.join(lines))
+                    lines.clear()
+    
+    if lines:
+        write(''.join(lines))
     
     return success_count, error_count
\ No newline at end of file
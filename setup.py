@@ -3,13 +3,52 @@
 Setup script for rnr package
 """
 
-from setuptools import setup, find_packages
+import os
+import sys
+from setuptools import Extension, setup, find_packages
+from setuptools.command.build_ext import build_ext
 from pathlib import Path
 
 # Read the README file
 readme_file = Path(__file__).parent / "README.md"
 long_description = readme_file.read_text() if readme_file.exists() else ""
 
+# Batched renameat(2) loop. optional=True lets the install carry on
+# without it (and fall back to os.rename) if it fails to compile.
+ext_modules = []
+if sys.platform.startswith("linux"):
+    ext_modules.append(Extension("rnr._renameat", ["rnr/_renameat.c"], optional=True))
+
+# Optionally compile the per-file loops with mypyc (RNR_USE_MYPYC=1).
+# The pure Python module is still installed and used if this is skipped,
+# whether mypyc itself is missing or the C compiler fails on its output.
+mypyc_modules = []
+if os.environ.get("RNR_USE_MYPYC") == "1":
+    try:
+        from mypyc.build import mypycify
+        mypyc_modules = mypycify(["rnr/_core_hot.py"])
+    except Exception as e:
+        print(f"mypyc compilation unavailable, installing pure Python: {e}")
+    for ext in mypyc_modules:
+        ext.optional = True
+    ext_modules += mypyc_modules
+
+
+class BuildExt(build_ext):
+    """Build the mypyc extensions all or nothing."""
+
+    def build_extension(self, ext):
+        # mypyc emits a shared runtime library followed by a small module
+        # that imports it. If the library failed (optional=True only warns),
+        # the module would shadow _core_hot.py and fail to import, so skip it
+        if ext in mypyc_modules[1:]:
+            runtime = mypyc_modules[0]
+            if not os.path.exists(self.get_ext_fullpath(runtime.name)):
+                print(f"skipping {ext.name}: {runtime.name} failed to build, "
+                      f"installing pure Python")
+                return
+        super().build_extension(ext)
+
 setup(
     name="rnr",
     version="0.1.0",
@@ -20,6 +59,8 @@ setup(
     author_email="your.email@example.com",
     url="https://github.com/yourusername/rnr",
     packages=find_packages(exclude=["tests", "tests.*"]),
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": BuildExt},
     python_requires=">=3.7",
     install_requires=[
         # No external dependencies for core functionality
@@ -28,6 +69,19 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-xdist>=3.0.0",
+        ],
+        # Single-pass matching for several --find patterns
+        "fast": [
+            "pyahocorasick",
+        ],
+        # Build-time compiler for the hot loops (RNR_USE_MYPYC=1)
+        "mypyc": [
+            "mypy",
+        ],
+        # Batched renames through io_uring on Linux
+        "uring": [
+            "liburing; platform_system == 'Linux'",
         ],
     },
     entry_points={
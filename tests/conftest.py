@@ -0,0 +1,60 @@
+"""
+Shared pytest configuration for the rnr test suite
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+# Memory-backed filesystem for test directories on Linux
+SHM_DIR = "/dev/shm"
+
+
+def pytest_configure(config):
+    """Put tmp_path and friends on tmpfs unless TMPDIR chooses otherwise"""
+    # The tests are almost all file creates, renames and stats, so a
+    # disk-backed /tmp only adds latency and timing noise. pytest builds
+    # its base temp dir under tempfile.gettempdir(), so this keeps its
+    # numbered directories and cleanup, including under xdist workers.
+    if os.environ.get("TMPDIR") or config.option.basetemp:
+        return
+    if sys.platform.startswith("linux") and os.path.isdir(SHM_DIR) \
+            and os.access(SHM_DIR, os.W_OK | os.X_OK):
+        tempfile.tempdir = SHM_DIR
+
+
+@pytest.fixture(scope="session")
+def rnr_runner():
+    """
+    Run the rnr CLI in this process, as if from the command line.
+    
+    rnr.cli is imported once per session (once per xdist worker), and
+    each call costs a function call rather than a fork and exec.
+    
+    Returns:
+        Function taking the command line arguments and an optional
+        input_text for stdin, returning a namespace with returncode,
+        stdout and stderr
+    """
+    from rnr.cli import main
+    
+    def run(*args, input_text=None):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        returncode = 0
+        with mock.patch("sys.stdin", io.StringIO(input_text or "")), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                main(list(args))
+            except SystemExit as e:
+                returncode = e.code or 0
+        return SimpleNamespace(returncode=returncode, stdout=stdout.getvalue(),
+                               stderr=stderr.getvalue())
+    
+    return run
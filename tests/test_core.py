@@ -4,338 +4,738 @@ Unit tests for rnr core functionality
 Run with: pytest tests/test_core.py -v
 """
 
-import unittest
-import tempfile
-import shutil
-from pathlib import Path
+import io
+import os
+import sys
+from unittest import mock
 import pytest
 
+from rnr import _native, _uring, core
+from rnr.colors import Colors, NoColors, get_colors
 from rnr.core import (
     find_files,
     generate_rename_pairs,
     check_conflicts,
-    apply_renames
+    apply_renames,
+    find_and_pair,
+    find_paths,
+    iter_rename_pairs,
+    generate_path_pairs,
+    generate_path_pairs_rules,
+    compile_rules,
+    PARALLEL_THRESHOLD
 )
 
 
+# Test file discovery functionality
+@pytest.fixture
+def file_tree(tmp_path):
+    """Create a temporary directory structure for testing"""
+    # Create test file structure
+    # root/
+    #   file1.txt
+    #   file2.log
+    #   subdir1/
+    #     file3.txt
+    #     file4.md
+    #   subdir2/
+    #     file5.txt
+    
+    (tmp_path / "file1.txt").touch()
+    (tmp_path / "file2.log").touch()
+    
+    (tmp_path / "subdir1").mkdir()
+    (tmp_path / "subdir1" / "file3.txt").touch()
+    (tmp_path / "subdir1" / "file4.md").touch()
+    
+    (tmp_path / "subdir2").mkdir()
+    (tmp_path / "subdir2" / "file5.txt").touch()
+    
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_find_files_recursive(file_tree):
+    """Test recursive file discovery"""
+    files = find_files(file_tree, recursive=True)
+    assert len(files) == 5
+
+
+@pytest.mark.unit
+def test_find_files_non_recursive(file_tree):
+    """Test non-recursive file discovery"""
+    files = find_files(file_tree, recursive=False)
+    assert len(files) == 2
+    file_names = [f.name for f in files]
+    assert "file1.txt" in file_names
+    assert "file2.log" in file_names
+
+
+@pytest.mark.unit
+def test_find_files_with_pattern(file_tree):
+    """Test file discovery with pattern matching"""
+    files = find_files(file_tree, pattern=".txt", recursive=True)
+    assert len(files) == 3
+    for file in files:
+        assert ".txt" in file.name
+
+
 @pytest.mark.unit
-class TestFileDiscovery(unittest.TestCase):
-    """Test file discovery functionality"""
+def test_find_files_no_matches(file_tree):
+    """Test file discovery with no matches"""
+    files = find_files(file_tree, pattern=".xyz", recursive=True)
+    assert len(files) == 0
+
+
+@pytest.mark.unit
+def test_find_files_case_sensitive(file_tree):
+    """Test that pattern matching is case sensitive"""
+    (file_tree / "FILE_CAPS.TXT").touch()
+    files = find_files(file_tree, pattern=".txt", recursive=False)
+    # Should not match .TXT
+    assert len(files) == 1
+
+
+@pytest.mark.unit
+def test_find_paths_returns_strings(file_tree):
+    """Test the string-based discovery API"""
+    paths = find_paths(str(file_tree), pattern=".txt", recursive=True, sort=True)
+    assert paths == [
+        str(file_tree / "file1.txt"),
+        str(file_tree / "subdir1" / "file3.txt"),
+        str(file_tree / "subdir2" / "file5.txt"),
+    ]
+
+
+@pytest.mark.unit
+def test_find_files_does_not_follow_directory_symlinks(file_tree):
+    """Test that symlinked directories are not descended into"""
+    (file_tree / "link").symlink_to(file_tree / "subdir1", target_is_directory=True)
+    files = find_files(file_tree, recursive=True)
+    assert len(files) == 5
+
+
+# Test rename pair generation logic
+def test_generate_rename_pairs_basic(tmp_path):
+    """Test basic rename pair generation"""
+    file1 = tmp_path / "test_file.txt"
+    file2 = tmp_path / "another_test.log"
+    file1.touch()
+    file2.touch()
+    
+    files = [file1, file2]
+    pairs = generate_rename_pairs(files, "test", "demo")
+    
+    assert len(pairs) == 2
+    assert pairs[0][1].name == "demo_file.txt"
+    assert pairs[1][1].name == "another_demo.log"
+
+
+def test_generate_rename_pairs_no_change(tmp_path):
+    """Test that files without pattern don't get renamed"""
+    file1 = tmp_path / "file.txt"
+    file1.touch()
     
-    def setUp(self):
-        """Create a temporary directory structure for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-        
-        # Create test file structure
-        # root/
-        #   file1.txt
-        #   file2.log
-        #   subdir1/
-        #     file3.txt
-        #     file4.md
-        #   subdir2/
-        #     file5.txt
-        
-        (self.test_path / "file1.txt").touch()
-        (self.test_path / "file2.log").touch()
-        
-        (self.test_path / "subdir1").mkdir()
-        (self.test_path / "subdir1" / "file3.txt").touch()
-        (self.test_path / "subdir1" / "file4.md").touch()
-        
-        (self.test_path / "subdir2").mkdir()
-        (self.test_path / "subdir2" / "file5.txt").touch()
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def test_find_files_recursive(self):
-        """Test recursive file discovery"""
-        files = find_files(self.test_path, recursive=True)
-        self.assertEqual(len(files), 5)
-    
-    def test_find_files_non_recursive(self):
-        """Test non-recursive file discovery"""
-        files = find_files(self.test_path, recursive=False)
-        self.assertEqual(len(files), 2)
-        file_names = [f.name for f in files]
-        self.assertIn("file1.txt", file_names)
-        self.assertIn("file2.log", file_names)
-    
-    def test_find_files_with_pattern(self):
-        """Test file discovery with pattern matching"""
-        files = find_files(self.test_path, pattern=".txt", recursive=True)
-        self.assertEqual(len(files), 3)
-        for file in files:
-            self.assertIn(".txt", file.name)
-    
-    def test_find_files_no_matches(self):
-        """Test file discovery with no matches"""
-        files = find_files(self.test_path, pattern=".xyz", recursive=True)
-        self.assertEqual(len(files), 0)
-    
-    def test_find_files_case_sensitive(self):
-        """Test that pattern matching is case sensitive"""
-        (self.test_path / "FILE_CAPS.TXT").touch()
-        files = find_files(self.test_path, pattern=".txt", recursive=False)
-        # Should not match .TXT
-        self.assertEqual(len(files), 1)
-
-
-class TestRenameLogic(unittest.TestCase):
-    """Test rename pair generation logic"""
-    
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def test_generate_rename_pairs_basic(self):
-        """Test basic rename pair generation"""
-        file1 = self.test_path / "test_file.txt"
-        file2 = self.test_path / "another_test.log"
-        file1.touch()
-        file2.touch()
-        
-        files = [file1, file2]
-        pairs = generate_rename_pairs(files, "test", "demo")
-        
-        self.assertEqual(len(pairs), 2)
-        self.assertEqual(pairs[0][1].name, "demo_file.txt")
-        self.assertEqual(pairs[1][1].name, "another_demo.log")
-    
-    def test_generate_rename_pairs_no_change(self):
-        """Test that files without pattern don't get renamed"""
-        file1 = self.test_path / "file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, "xyz", "abc")
-        
-        self.assertEqual(len(pairs), 0)
+    files = [file1]
+    pairs = generate_rename_pairs(files, "xyz", "abc")
     
-    def test_generate_rename_pairs_removal(self):
-        """Test removing pattern from filenames"""
-        file1 = self.test_path / "file_backup.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, "_backup", "")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "file.txt")
+    assert len(pairs) == 0
+
+
+def test_generate_rename_pairs_removal(tmp_path):
+    """Test removing pattern from filenames"""
+    file1 = tmp_path / "file_backup.txt"
+    file1.touch()
     
-    def test_generate_rename_pairs_multiple_occurrences(self):
-        """Test replacing multiple occurrences in filename"""
-        file1 = self.test_path / "test_test_file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, "test", "demo")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "demo_demo_file.txt")
-    
-    def test_generate_rename_pairs_preserves_path(self):
-        """Test that parent directory is preserved"""
-        subdir = self.test_path / "subdir"
-        subdir.mkdir()
-        file1 = subdir / "test_file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, "test", "demo")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].parent, subdir)
+    files = [file1]
+    pairs = generate_rename_pairs(files, "_backup", "")
+    
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "file.txt"
 
 
-class TestConflictDetection(unittest.TestCase):
-    """Test conflict detection logic"""
+def test_generate_rename_pairs_multiple_occurrences(tmp_path):
+    """Test replacing multiple occurrences in filename"""
+    file1 = tmp_path / "test_test_file.txt"
+    file1.touch()
     
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
+    files = [file1]
+    pairs = generate_rename_pairs(files, "test", "demo")
     
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "demo_demo_file.txt"
+
+
+def test_generate_rename_pairs_empty_find(tmp_path):
+    """Test that an empty find pattern is rejected"""
+    file1 = tmp_path / "file.txt"
+    file1.touch()
     
-    def test_no_conflicts(self):
-        """Test scenario with no conflicts"""
-        file1 = self.test_path / "file1.txt"
-        file2 = self.test_path / "file2.txt"
-        file1.touch()
-        file2.touch()
-        
-        new1 = self.test_path / "renamed1.txt"
-        new2 = self.test_path / "renamed2.txt"
-        
-        pairs = [(file1, new1), (file2, new2)]
-        conflicts = check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 0)
-    
-    def test_existing_file_conflict(self):
-        """Test conflict when target file already exists"""
-        file1 = self.test_path / "file1.txt"
-        existing = self.test_path / "existing.txt"
-        file1.touch()
-        existing.touch()
-        
-        pairs = [(file1, existing)]
-        conflicts = check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 1)
-        self.assertEqual(conflicts[0], (file1, existing))
-    
-    def test_duplicate_target_conflict(self):
-        """Test conflict when multiple files would have same target name"""
-        file1 = self.test_path / "file1.txt"
-        file2 = self.test_path / "file2.txt"
-        file1.touch()
-        file2.touch()
-        
-        target = self.test_path / "same_name.txt"
-        pairs = [(file1, target), (file2, target)]
-        conflicts = check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 1)
+    with pytest.raises(ValueError):
+        generate_rename_pairs([file1], "", "x")
+
+
+def test_generate_rename_pairs_preserves_path(tmp_path):
+    """Test that parent directory is preserved"""
+    subdir = tmp_path / "subdir"
+    subdir.mkdir()
+    file1 = subdir / "test_file.txt"
+    file1.touch()
+    
+    files = [file1]
+    pairs = generate_rename_pairs(files, "test", "demo")
+    
+    assert len(pairs) == 1
+    assert pairs[0][1].parent == subdir
+
+
+def test_generate_path_pairs(tmp_path):
+    """Test pair generation on plain path strings"""
+    paths = [str(tmp_path / "test_file.txt"), str(tmp_path / "other.txt")]
+    pairs = generate_path_pairs(paths, "test", "demo")
     
-    def test_no_conflict_same_file(self):
-        """Test that renaming file to itself is not a conflict"""
-        file1 = self.test_path / "file1.txt"
-        file1.touch()
-        
-        pairs = [(file1, file1)]
-        conflicts = check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 0)
+    assert pairs == [(paths[0], str(tmp_path / "demo_file.txt"))]
+
+
+def test_generate_path_pairs_rules(tmp_path):
+    """Test pair generation with several rules in one pass"""
+    paths = [str(tmp_path / "my old-file.txt"), str(tmp_path / "other.txt")]
+    pairs = generate_path_pairs_rules(paths, [(" ", "_"), ("-", "_"), ("old", "new")])
+    
+    assert pairs == [(paths[0], str(tmp_path / "my_new_file.txt"))]
+    with pytest.raises(ValueError):
+        generate_path_pairs_rules(paths, [])
+
+
+def test_iter_rename_pairs_is_lazy(tmp_path):
+    """Test that pairs stream from the walk and rules are checked eagerly"""
+    (tmp_path / "test_a.txt").touch()
+    (tmp_path / "test_b.txt").touch()
+    
+    pairs = iter_rename_pairs(str(tmp_path), [("test", "demo")], sort=True)
+    
+    assert not isinstance(pairs, list)
+    assert next(pairs)[1] == str(tmp_path / "demo_a.txt")
+    assert len(list(pairs)) == 1
+    with pytest.raises(ValueError):
+        iter_rename_pairs(str(tmp_path), [("", "x")])
+
+
+def test_compile_rules_multiple_patterns():
+    """Test applying several rules in one pass"""
+    rename = compile_rules([(" ", "_"), ("-", "_"), ("old", "new")])
+    
+    assert rename("my old-file.txt") == "my_new_file.txt"
+    assert rename("untouched.txt") == "untouched.txt"
+
+
+def test_compile_rules_overlapping_patterns():
+    """Test that the longest leftmost match wins and output is not re-scanned"""
+    rename = compile_rules([("ab", "1"), ("abc", "2"), ("b", "ab")])
+    
+    assert rename("abcab") == "21"
+    assert rename("bb") == "abab"
+
+
+def test_compile_rules_regex_fallback():
+    """Test the regex path used when pyahocorasick is not installed"""
+    rules = [("ab", "1"), ("abc", "2"), ("b", "ab")]
+    with mock.patch("rnr.core.ahocorasick", None):
+        rename = compile_rules(rules)
+    
+    assert rename("abcab") == "21"
+    assert rename("bb") == "abab"
+
+
+def test_compile_rules_few_rules_skip_automaton():
+    """Test that the automaton is only built for many patterns"""
+    with mock.patch("rnr.core.ahocorasick") as fake_ahocorasick:
+        rename = compile_rules([(" ", "_"), ("-", "_")])
+    
+    fake_ahocorasick.Automaton.assert_not_called()
+    assert rename("a b-c") == "a_b_c"
 
 
-class TestApplyRenames(unittest.TestCase):
-    """Test actual file renaming operations"""
+@pytest.mark.skipif(core.ahocorasick is None, reason="pyahocorasick not installed")
+def test_compile_rules_automaton():
+    """Test that the Aho-Corasick path matches the regex path"""
+    rules = [("ab", "1"), ("abc", "2"), ("b", "ab")]
+    with mock.patch("rnr.core.AHOCORASICK_MIN_RULES", 2):
+        rename = compile_rules(rules)
+    
+    assert rename("abcab") == "21"
+    assert rename("bb") == "abab"
+
+
+def test_find_and_pair(tmp_path):
+    """Test single-pass discovery and pair generation"""
+    subdir = tmp_path / "subdir"
+    subdir.mkdir()
+    (tmp_path / "test_file.txt").touch()
+    (tmp_path / "other.txt").touch()
+    (subdir / "nested_test.md").touch()
+    
+    pairs = find_and_pair(str(tmp_path), "test", "demo", recursive=True, sort=True)
+    
+    assert pairs == [
+        (str(subdir / "nested_test.md"), str(subdir / "nested_demo.md")),
+        (str(tmp_path / "test_file.txt"), str(tmp_path / "demo_file.txt")),
+    ]
+    
+    pairs = find_and_pair(str(tmp_path), "test", "demo", recursive=False)
+    assert len(pairs) == 1
+
+
+# Test conflict detection logic
+def test_no_conflicts(tmp_path):
+    """Test scenario with no conflicts"""
+    file1 = tmp_path / "file1.txt"
+    file2 = tmp_path / "file2.txt"
+    file1.touch()
+    file2.touch()
     
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
+    new1 = tmp_path / "renamed1.txt"
+    new2 = tmp_path / "renamed2.txt"
     
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
+    pairs = [(file1, new1), (file2, new2)]
+    conflicts = check_conflicts(pairs)
     
-    def test_apply_renames_success(self):
-        """Test successful rename operation"""
-        file1 = self.test_path / "old_name.txt"
-        file1.touch()
-        
-        new_path = self.test_path / "new_name.txt"
-        pairs = [(file1, new_path)]
-        
-        success, errors = apply_renames(pairs, verbose=False)
-        
-        self.assertEqual(success, 1)
-        self.assertEqual(errors, 0)
-        self.assertTrue(new_path.exists())
-        self.assertFalse(file1.exists())
-    
-    def test_apply_renames_multiple(self):
-        """Test renaming multiple files"""
-        file1 = self.test_path / "file1.txt"
-        file2 = self.test_path / "file2.txt"
-        file1.touch()
-        file2.touch()
-        
-        new1 = self.test_path / "renamed1.txt"
-        new2 = self.test_path / "renamed2.txt"
-        pairs = [(file1, new1), (file2, new2)]
-        
+    assert len(conflicts) == 0
+
+
+def test_existing_file_conflict(tmp_path):
+    """Test conflict when target file already exists"""
+    file1 = tmp_path / "file1.txt"
+    existing = tmp_path / "existing.txt"
+    file1.touch()
+    existing.touch()
+    
+    pairs = [(file1, existing)]
+    conflicts = check_conflicts(pairs)
+    
+    assert len(conflicts) == 1
+    assert conflicts[0] == (file1, existing)
+
+
+def test_duplicate_target_conflict(tmp_path):
+    """Test conflict when multiple files would have same target name"""
+    file1 = tmp_path / "file1.txt"
+    file2 = tmp_path / "file2.txt"
+    file1.touch()
+    file2.touch()
+    
+    target = tmp_path / "same_name.txt"
+    pairs = [(file1, target), (file2, target)]
+    conflicts = check_conflicts(pairs)
+    
+    assert len(conflicts) == 1
+
+
+def test_no_conflict_same_file(tmp_path):
+    """Test that renaming file to itself is not a conflict"""
+    file1 = tmp_path / "file1.txt"
+    file1.touch()
+    
+    pairs = [(file1, file1)]
+    conflicts = check_conflicts(pairs)
+    
+    assert len(conflicts) == 0
+
+
+def test_conflict_with_walked_directory_contents(tmp_path):
+    """Test conflict detection using listings from find_and_pair"""
+    (tmp_path / "file_old.txt").touch()
+    (tmp_path / "file_new.txt").touch()
+    
+    dir_contents = {}
+    pairs = find_and_pair(str(tmp_path), "_old", "_new", dir_contents=dir_contents)
+    conflicts = check_conflicts(pairs, dir_contents)
+    
+    assert str(tmp_path) in dir_contents
+    assert len(conflicts) == 1
+    assert conflicts[0][1] == str(tmp_path / "file_new.txt")
+
+
+def test_conflict_case_insensitive_filesystem(tmp_path):
+    """Test that a listing miss is checked on disk when only case differs"""
+    (tmp_path / "Report.txt").touch()
+    (tmp_path / "REPORT_new.txt").touch()
+    
+    dir_contents = {}
+    pairs = find_and_pair(str(tmp_path), "Report", "report_new", dir_contents=dir_contents)
+    
+    # Case-sensitive filesystem: report_new.txt is a different file
+    assert check_conflicts(pairs, dir_contents) == []
+    
+    # Case-insensitive filesystem: report_new.txt is REPORT_new.txt
+    real_lstat = os.lstat
+    
+    def lstat_ignoring_case(path):
+        parent, name = os.path.split(path)
+        for entry in os.listdir(parent):
+            if entry.casefold() == name.casefold():
+                return real_lstat(os.path.join(parent, entry))
+        raise FileNotFoundError(path)
+    
+    with mock.patch("rnr.core.os.lstat", side_effect=lstat_ignoring_case) as lstat:
+        conflicts = check_conflicts(pairs, dir_contents)
+    
+    lstat.assert_called_once_with(str(tmp_path / "report_new.txt"))
+    assert conflicts == pairs
+
+
+def test_dangling_symlink_conflict(tmp_path):
+    """Test that a broken symlink at the target counts as a conflict"""
+    file1 = tmp_path / "file1.txt"
+    file1.touch()
+    link = tmp_path / "link.txt"
+    link.symlink_to(tmp_path / "missing.txt")
+    
+    conflicts = check_conflicts([(file1, link)])
+    
+    assert len(conflicts) == 1
+
+
+# Test actual file renaming operations
+def test_apply_renames_success(tmp_path):
+    """Test successful rename operation"""
+    file1 = tmp_path / "old_name.txt"
+    file1.touch()
+    
+    new_path = tmp_path / "new_name.txt"
+    pairs = [(file1, new_path)]
+    
+    success, errors = apply_renames(pairs, verbose=False)
+    
+    assert success == 1
+    assert errors == 0
+    assert new_path.exists()
+    assert not file1.exists()
+
+
+def test_apply_renames_multiple(tmp_path):
+    """Test renaming multiple files"""
+    file1 = tmp_path / "file1.txt"
+    file2 = tmp_path / "file2.txt"
+    file1.touch()
+    file2.touch()
+    
+    new1 = tmp_path / "renamed1.txt"
+    new2 = tmp_path / "renamed2.txt"
+    pairs = [(file1, new1), (file2, new2)]
+    
+    success, errors = apply_renames(pairs, verbose=False)
+    
+    assert success == 2
+    assert errors == 0
+    assert new1.exists()
+    assert new2.exists()
+
+
+def test_apply_renames_string_pairs(tmp_path):
+    """Test renaming with plain string paths"""
+    file1 = tmp_path / "old_name.txt"
+    file1.touch()
+    
+    new_path = tmp_path / "new_name.txt"
+    pairs = [(str(file1), str(new_path))]
+    
+    success, errors = apply_renames(pairs, verbose=False)
+    
+    assert success == 1
+    assert errors == 0
+    assert new_path.exists()
+
+
+def test_apply_renames_from_generator(tmp_path):
+    """Test that apply_renames consumes a lazy iterator"""
+    files = [tmp_path / f"file{i}.txt" for i in range(3)]
+    for file_path in files:
+        file_path.touch()
+    
+    pairs = ((str(f), str(f.with_name("new_" + f.name))) for f in files)
+    success, errors = apply_renames(pairs, verbose=False)
+    
+    assert success == 3
+    assert errors == 0
+    assert (tmp_path / "new_file2.txt").exists()
+
+
+def test_apply_renames_large_batch(tmp_path):
+    """Test a batch big enough to use the automatic concurrent backends"""
+    pairs = []
+    for i in range(PARALLEL_THRESHOLD + 10):
+        old = tmp_path / f"file{i}.txt"
+        old.touch()
+        pairs.append((old, tmp_path / f"renamed{i}.txt"))
+    # One missing source should be counted as an error
+    pairs.append((tmp_path / "missing.txt", tmp_path / "never.txt"))
+    
+    success, errors = apply_renames(pairs, verbose=False, jobs=None)
+    
+    assert success == PARALLEL_THRESHOLD + 10
+    assert errors == 1
+    assert (tmp_path / "renamed0.txt").exists()
+    assert not (tmp_path / "file0.txt").exists()
+
+
+def test_apply_renames_chained_pairs_in_order(tmp_path):
+    """Test that by default a large batch of chained pairs runs in order"""
+    count = PARALLEL_THRESHOLD + 10
+    (tmp_path / "file0.txt").write_text("moved")
+    # file0 → file1 → ... only works if each rename sees the previous one
+    pairs = [(str(tmp_path / f"file{i}.txt"), str(tmp_path / f"file{i + 1}.txt"))
+             for i in range(count)]
+    
+    with mock.patch.object(_uring, "rename_batch") as uring_batch:
         success, errors = apply_renames(pairs, verbose=False)
-        
-        self.assertEqual(success, 2)
-        self.assertEqual(errors, 0)
-        self.assertTrue(new1.exists())
-        self.assertTrue(new2.exists())
+    
+    uring_batch.assert_not_called()
+    assert (success, errors) == (count, 0)
+    assert (tmp_path / f"file{count}.txt").read_text() == "moved"
+
+
+def test_apply_renames_jobs(tmp_path):
+    """Test that jobs=1 and an explicit pool size both rename everything"""
+    for jobs in (1, 4):
+        pairs = []
+        for i in range(PARALLEL_THRESHOLD + 10):
+            old = tmp_path / f"j{jobs}_file{i}.txt"
+            old.touch()
+            pairs.append((str(old), str(tmp_path / f"j{jobs}_renamed{i}.txt")))
+        
+        with mock.patch.object(_uring, "rename_batch") as uring_batch:
+            success, errors = apply_renames(pairs, verbose=False, jobs=jobs)
+        
+        uring_batch.assert_not_called()
+        assert success == PARALLEL_THRESHOLD + 10
+        assert errors == 0
+        assert (tmp_path / f"j{jobs}_renamed0.txt").exists()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"),
+                    reason="os.rename replaces the target outside Linux")
+def test_apply_renames_keeps_existing_target(tmp_path, capsys):
+    """Test that a target created after the conflict check is not overwritten"""
+    for jobs in (None, 1, 4):
+        old = tmp_path / f"j{jobs}_old.txt"
+        new = tmp_path / f"j{jobs}_new.txt"
+        old.write_text("old")
+        new.write_text("new")
+        pairs = [(str(old), str(new))] * (PARALLEL_THRESHOLD + 1 if jobs == 4 else 1)
+        
+        success, errors = apply_renames(pairs, verbose=False, jobs=jobs)
+        
+        assert success == 0
+        assert errors == len(pairs)
+        assert new.read_text() == "new"
+        assert old.exists()
+        assert "conflict" in capsys.readouterr().out
+
+
+def test_apply_renames_identity_pair(tmp_path, capsys):
+    """Test that renaming a file to itself is a successful no-op"""
+    for jobs in (None, 1, 4):
+        path = tmp_path / f"j{jobs}_same.txt"
+        path.write_text("same")
+        pairs = [(str(path), str(path))] * (PARALLEL_THRESHOLD + 1 if jobs == 4 else 1)
+        
+        success, errors = apply_renames(pairs, verbose=False, jobs=jobs)
+        
+        assert (success, errors) == (len(pairs), 0)
+        assert path.read_text() == "same"
+        assert "conflict" not in capsys.readouterr().out
+
+
+# Test the optional io_uring rename backend
+@pytest.mark.skipif(_uring.liburing is None, reason="liburing bindings not installed")
+def test_uring_rename_batch(tmp_path):
+    """Test that results line up with the input pairs"""
+    file1 = tmp_path / "file1.txt"
+    file1.touch()
+    pairs = [
+        (str(file1), str(tmp_path / "renamed1.txt")),
+        (str(tmp_path / "missing.txt"), str(tmp_path / "renamed2.txt")),
+    ]
+    
+    existing = tmp_path / "existing.txt"
+    existing.touch()
+    pairs.append((str(tmp_path / "renamed1.txt"), str(existing)))
+    pairs.append((str(existing), str(existing)))
+    
+    errors = _uring.rename_batch(pairs)
+    if errors is None:
+        pytest.skip("io_uring not available on this kernel")
+    
+    assert errors[0] is None
+    assert isinstance(errors[1], FileNotFoundError)
+    assert isinstance(errors[2], FileExistsError)
+    assert errors[3] is None
+    assert (tmp_path / "renamed1.txt").exists()
+
 
+@pytest.mark.skipif(_uring.liburing is None, reason="liburing bindings not installed")
+@pytest.mark.skipif(_native._renameat2 is None, reason="libc has no renameat2")
+def test_uring_rename_batch_einval_keeps_existing_target(tmp_path):
+    """Test that an EINVAL completion is retried without replacing the target"""
+    old = tmp_path / "old.txt"
+    moved = tmp_path / "moved.txt"
+    existing = tmp_path / "existing.txt"
+    old.write_text("old")
+    moved.write_text("moved")
+    existing.write_text("existing")
+    pairs = [(str(moved), str(tmp_path / "renamed.txt")), (str(old), str(existing))]
+    
+    # Unknown rename flags make every rename SQE complete with EINVAL, as on
+    # a kernel without IORING_OP_RENAMEAT
+    prep_rename = _uring.liburing.io_uring_prep_rename
+    
+    def prep_rename_einval(sqe, old_path, new_path, flags):
+        prep_rename(sqe, old_path, new_path, 0x80000000)
+    
+    with mock.patch.object(_uring.liburing, "io_uring_prep_rename", prep_rename_einval):
+        errors = _uring.rename_batch(pairs)
+    if errors is None:
+        pytest.skip("io_uring not available on this kernel")
+    
+    assert errors[0] is None
+    assert (tmp_path / "renamed.txt").read_text() == "moved"
+    assert isinstance(errors[1], FileExistsError)
+    assert existing.read_text() == "existing"
+    assert old.exists()
 
-class TestEdgeCases(unittest.TestCase):
-    """Test edge cases and special scenarios"""
+
+# Test the optional C rename backend
+@pytest.mark.skipif(_native._renameat is None, reason="_renameat extension not built")
+def test_native_rename_batch(tmp_path):
+    """Test that results line up with the input pairs"""
+    file1 = tmp_path / "file1.txt"
+    file1.touch()
+    missing = str(tmp_path / "missing.txt")
+    pairs = [
+        (str(file1), str(tmp_path / "renamed1.txt")),
+        (missing, str(tmp_path / "renamed2.txt")),
+    ]
+    
+    existing = tmp_path / "existing.txt"
+    existing.touch()
+    pairs.append((str(tmp_path / "renamed1.txt"), str(existing)))
+    pairs.append((str(existing), str(existing)))
+    
+    errors = _native.rename_batch(pairs)
+    
+    assert errors[0] is None
+    assert isinstance(errors[1], FileNotFoundError)
+    assert errors[1].filename == missing
+    assert isinstance(errors[2], FileExistsError)
+    assert errors[3] is None
+    assert (tmp_path / "renamed1.txt").exists()
+
+
+@pytest.mark.skipif(_native._renameat2 is None, reason="libc has no renameat2")
+def test_native_rename_noreplace(tmp_path):
+    """Test that rename_noreplace renames, but never over an existing file"""
+    old = tmp_path / "old.txt"
+    existing = tmp_path / "existing.txt"
+    old.write_text("old")
+    existing.write_text("existing")
+    
+    with pytest.raises(FileExistsError):
+        _native.rename_noreplace(old, existing)
+    assert existing.read_text() == "existing"
+    
+    _native.rename_noreplace(old, tmp_path / "new.txt")
+    assert (tmp_path / "new.txt").read_text() == "old"
+    
+    # The target being the source itself is not a conflict
+    _native.rename_noreplace(existing, existing)
+    assert existing.read_text() == "existing"
+
+
+@pytest.mark.skipif(_native._renameat is None, reason="_renameat extension not built")
+def test_native_rename_batch_rejects_str():
+    """Test that the extension only takes bytes pairs"""
+    with pytest.raises(TypeError):
+        _native._renameat.batch_rename([("a", "b")])
+
+
+# Test edge cases and special scenarios
+def test_empty_directory(tmp_path):
+    """Test behavior with empty directory"""
+    files = find_files(tmp_path, recursive=True)
+    assert len(files) == 0
+
+
+def test_special_characters_in_filename(tmp_path):
+    """Test handling files with special characters"""
+    file1 = tmp_path / "file (1).txt"
+    file1.touch()
     
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
+    files = [file1]
+    pairs = generate_rename_pairs(files, " (1)", "")
     
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "file.txt"
+
+
+def test_spaces_replacement(tmp_path):
+    """Test replacing spaces in filenames"""
+    file1 = tmp_path / "my test file.txt"
+    file1.touch()
     
-    def test_empty_directory(self):
-        """Test behavior with empty directory"""
-        files = find_files(self.test_path, recursive=True)
-        self.assertEqual(len(files), 0)
+    files = [file1]
+    pairs = generate_rename_pairs(files, " ", "_")
     
-    def test_special_characters_in_filename(self):
-        """Test handling files with special characters"""
-        file1 = self.test_path / "file (1).txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, " (1)", "")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "file.txt")
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "my_test_file.txt"
+
+
+def test_extension_replacement(tmp_path):
+    """Test replacing file extensions"""
+    file1 = tmp_path / "document.txt"
+    file1.touch()
     
-    def test_spaces_replacement(self):
-        """Test replacing spaces in filenames"""
-        file1 = self.test_path / "my test file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, " ", "_")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "my_test_file.txt")
+    files = [file1]
+    pairs = generate_rename_pairs(files, ".txt", ".md")
     
-    def test_extension_replacement(self):
-        """Test replacing file extensions"""
-        file1 = self.test_path / "document.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, ".txt", ".md")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "document.md")
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "document.md"
+
+
+def test_unicode_filenames(tmp_path):
+    """Test handling unicode characters in filenames"""
+    file1 = tmp_path / "café_file.txt"
+    file1.touch()
     
-    def test_unicode_filenames(self):
-        """Test handling unicode characters in filenames"""
-        file1 = self.test_path / "café_file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = generate_rename_pairs(files, "café", "coffee")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "coffee_file.txt")
+    files = [file1]
+    pairs = generate_rename_pairs(files, "café", "coffee")
     
-    def test_hidden_files(self):
-        """Test that hidden files (starting with .) are found"""
-        file1 = self.test_path / ".hidden_file"
-        file1.touch()
-        
-        files = find_files(self.test_path, recursive=False)
-        self.assertEqual(len(files), 1)
-        self.assertEqual(files[0].name, ".hidden_file")
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "coffee_file.txt"
+
+
+def test_hidden_files(tmp_path):
+    """Test that hidden files (starting with .) are found"""
+    file1 = tmp_path / ".hidden_file"
+    file1.touch()
+    
+    files = find_files(tmp_path, recursive=False)
+    assert len(files) == 1
+    assert files[0].name == ".hidden_file"
+
+
+# Test terminal color selection
+def test_no_colors_when_not_a_tty():
+    """Test that escape codes are dropped for non-terminal output"""
+    assert get_colors(io.StringIO()) is NoColors
+
+
+def test_colors_on_a_tty():
+    """Test that a terminal gets ANSI colors"""
+    stream = mock.Mock()
+    stream.isatty.return_value = True
+    assert get_colors(stream) is Colors
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
\ No newline at end of file
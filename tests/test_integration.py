@@ -2,476 +2,615 @@
 """
 Integration tests for rnr - testing the full CLI workflow
 Run with: pytest tests/test_integration.py -v
+
+Most tests run the CLI in-process through the rnr_runner fixture
+from conftest.py.
 """
 
-import unittest
-import tempfile
+import os
 import shutil
+import tempfile
 import subprocess
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 import pytest
 
 
+def run_rnr(*args, input_text=None):
+    """
+    Run rnr as a separate process, for tests of the entry point itself.
+    
+    Output goes to temporary files rather than pipes and is read once the
+    process has exited, so a large amount of output never has to be
+    drained through a pipe while the process runs.
+    
+    Args:
+        *args: Command line arguments
+        input_text: Text to send to stdin (for confirmation prompts)
+        
+    Returns:
+        Namespace with returncode, stdout, stderr
+    """
+    cmd = [sys.executable, "-m", "rnr.cli", *args]
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        result = subprocess.run(cmd, input=(input_text or "").encode(), stdout=out, stderr=err)
+        out.seek(0)
+        err.seek(0)
+        return SimpleNamespace(returncode=result.returncode,
+                               stdout=out.read().decode(), stderr=err.read().decode())
+
+
+def link_tree(src: Path, dst: Path):
+    """
+    Recreate the tree at src inside dst, hard-linking the files.
+    
+    Renaming a link in dst only changes dst's directory entries, so the
+    source tree is left as it was. Tests must not write to file contents,
+    which are shared. Falls back to copying where links are not supported.
+    """
+    for dirpath, dirnames, filenames in os.walk(src):
+        target = dst / Path(dirpath).relative_to(src)
+        for name in dirnames:
+            (target / name).mkdir()
+        for name in filenames:
+            try:
+                os.link(os.path.join(dirpath, name), target / name)
+            except OSError:
+                shutil.copyfile(os.path.join(dirpath, name), target / name)
+
+
+@pytest.fixture(scope="session")
+def cli_template(tmp_path_factory):
+    """Build the read-only file tree shared by the CLI integration tests once"""
+    template = tmp_path_factory.mktemp("cli_template")
+    
+    # Create test file structure
+    (template / "file 1.txt").touch()
+    (template / "file 2.txt").touch()
+    (template / "document_old.log").touch()
+    
+    subdir = template / "subdir"
+    subdir.mkdir()
+    (subdir / "nested file.md").touch()
+    (subdir / "another_old.txt").touch()
+    
+    return template
+
+
+# Integration tests for CLI functionality
+@pytest.fixture
+def cli_tree(tmp_path, cli_template):
+    """Link the shared test file structure into a fresh directory"""
+    link_tree(cli_template, tmp_path)
+    return tmp_path
+
+
 @pytest.mark.integration
-class TestCLIIntegration(unittest.TestCase):
-    """Integration tests for CLI functionality"""
+def test_dry_run_mode(rnr_runner, cli_tree):
+    """Test that dry-run mode doesn't modify files"""
+    # Run with dry-run
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(cli_tree),
+        "--dry-run"
+    )
     
-    def setUp(self):
-        """Create a temporary directory structure for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-        
-        # Create test file structure
-        (self.test_path / "file 1.txt").touch()
-        (self.test_path / "file 2.txt").touch()
-        (self.test_path / "document_old.log").touch()
-        
-        subdir = self.test_path / "subdir"
-        subdir.mkdir()
-        (subdir / "nested file.md").touch()
-        (subdir / "another_old.txt").touch()
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def run_rnr(self, *args, input_text=None):
-        """
-        Helper to run rnr CLI command
-        
-        Args:
-            *args: Command line arguments
-            input_text: Text to send to stdin (for confirmation prompts)
-            
-        Returns:
-            CompletedProcess with returncode, stdout, stderr
-        """
-        cmd = [sys.executable, "-m", "rnr.cli"] + list(args)
-        result = subprocess.run(
-            cmd,
-            input=input_text,
-            capture_output=True,
-            text=True
-        )
-        return result
+    # Should succeed
+    assert result.returncode == 0
     
-    def test_dry_run_mode(self):
-        """Test that dry-run mode doesn't modify files"""
-        # Run with dry-run
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", str(self.test_path),
-            "--dry-run"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Files should still have spaces
-        self.assertTrue((self.test_path / "file 1.txt").exists())
-        self.assertTrue((self.test_path / "file 2.txt").exists())
-        self.assertFalse((self.test_path / "file_1.txt").exists())
-        
-        # Output should mention preview
-        self.assertIn("Preview", result.stdout)
-        self.assertIn("Dry-run mode", result.stdout)
-    
-    def test_basic_rename_with_confirmation(self):
-        """Test basic rename with yes confirmation"""
-        # Run with confirmation 'y'
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", str(self.test_path),
-            "--no-recursive",
-            input_text="y\n"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Files should be renamed
-        self.assertFalse((self.test_path / "file 1.txt").exists())
-        self.assertFalse((self.test_path / "file 2.txt").exists())
-        self.assertTrue((self.test_path / "file_1.txt").exists())
-        self.assertTrue((self.test_path / "file_2.txt").exists())
-        
-        # Output should show success
-        self.assertIn("Successfully renamed", result.stdout)
-    
-    def test_rename_with_yes_flag(self):
-        """Test rename with --yes flag (no confirmation)"""
-        result = self.run_rnr(
-            "--find", "_old",
-            "--replace", "_new",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Files should be renamed
-        self.assertFalse((self.test_path / "document_old.log").exists())
-        self.assertTrue((self.test_path / "document_new.log").exists())
-        
-        # Should not ask for confirmation
-        self.assertNotIn("Apply these changes?", result.stdout)
-    
-    def test_recursive_rename(self):
-        """Test recursive renaming through subdirectories"""
-        result = self.run_rnr(
-            "--find", "_old",
-            "--replace", "_new",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Files in root and subdir should be renamed
-        self.assertTrue((self.test_path / "document_new.log").exists())
-        self.assertTrue((self.test_path / "subdir" / "another_new.txt").exists())
+    # Files should still have spaces
+    assert (cli_tree / "file 1.txt").exists()
+    assert (cli_tree / "file 2.txt").exists()
+    assert not (cli_tree / "file_1.txt").exists()
     
-    def test_non_recursive_rename(self):
-        """Test non-recursive renaming (only current directory)"""
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", str(self.test_path),
-            "--no-recursive",
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Root files should be renamed
-        self.assertTrue((self.test_path / "file_1.txt").exists())
-        
-        # Subdir files should NOT be renamed
-        self.assertTrue((self.test_path / "subdir" / "nested file.md").exists())
-        self.assertFalse((self.test_path / "subdir" / "nested_file.md").exists())
-    
-    def test_no_matches(self):
-        """Test behavior when no files match the pattern"""
-        result = self.run_rnr(
-            "--find", "nonexistent",
-            "--replace", "something",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed with no changes
-        self.assertEqual(result.returncode, 0)
-        
-        # Output should indicate no matches
-        self.assertIn("No files match", result.stdout)
+    # Output should mention preview
+    assert "Preview" in result.stdout
+    assert "Dry-run mode" in result.stdout
+
+
+@pytest.mark.integration
+def test_basic_rename_with_confirmation(rnr_runner, cli_tree):
+    """Test basic rename with yes confirmation"""
+    # Run with confirmation 'y'
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(cli_tree),
+        "--no-recursive",
+        input_text="y\n"
+    )
     
-    def test_cancel_confirmation(self):
-        """Test canceling operation at confirmation prompt"""
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", str(self.test_path),
-            input_text="n\n"
-        )
-        
-        # Should succeed but not rename
-        self.assertEqual(result.returncode, 0)
-        
-        # Files should not be renamed
-        self.assertTrue((self.test_path / "file 1.txt").exists())
-        self.assertFalse((self.test_path / "file_1.txt").exists())
-        
-        # Output should show cancelled
-        self.assertIn("Cancelled", result.stdout)
+    # Should succeed
+    assert result.returncode == 0
     
-    def test_verbose_mode(self):
-        """Test verbose output mode"""
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", str(self.test_path),
-            "--verbose",
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Should show individual file operations
-        self.assertIn("✓", result.stdout)
-        self.assertIn("→", result.stdout)
+    # Files should be renamed
+    assert not (cli_tree / "file 1.txt").exists()
+    assert not (cli_tree / "file 2.txt").exists()
+    assert (cli_tree / "file_1.txt").exists()
+    assert (cli_tree / "file_2.txt").exists()
     
-    def test_invalid_path(self):
-        """Test error handling for invalid path"""
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", "/nonexistent/path/xyz"
-        )
-        
-        # Should fail
-        self.assertEqual(result.returncode, 1)
-        
-        # Should show error message
-        self.assertIn("", result.stderr)
-    
-    def test_remove_pattern(self):
-        """Test removing a pattern from filenames"""
-        result = self.run_rnr(
-            "--find", "_old",
-            "--replace", "",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Pattern should be removed
-        self.assertFalse((self.test_path / "document_old.log").exists())
-        self.assertTrue((self.test_path / "document.log").exists())
-
-
-class TestCLIConflicts(unittest.TestCase):
-    """Integration tests for conflict detection"""
-    
-    def setUp(self):
-        """Create test directory with potential conflicts"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def run_rnr(self, *args, input_text=None):
-        """Helper to run rnr CLI command"""
-        cmd = [sys.executable, "-m", "rnr.cli"] + list(args)
-        result = subprocess.run(
-            cmd,
-            input=input_text,
-            capture_output=True,
-            text=True
-        )
-        return result
+    # Output should show success
+    assert "Successfully renamed" in result.stdout
+
+
+@pytest.mark.integration
+def test_rename_with_yes_flag(rnr_runner, cli_tree):
+    """Test rename with --yes flag (no confirmation)"""
+    result = rnr_runner(
+        "--find", "_old",
+        "--replace", "_new",
+        "--path", str(cli_tree),
+        "--yes"
+    )
     
-    def test_existing_file_conflict(self):
-        """Test conflict when target file already exists"""
-        # Create files that would conflict
-        (self.test_path / "file_old.txt").touch()
-        (self.test_path / "file_new.txt").touch()  # Target already exists
-        
-        result = self.run_rnr(
-            "--find", "_old",
-            "--replace", "_new",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should fail due to conflict
-        self.assertEqual(result.returncode, 1)
-        
-        # Should report conflict
-        self.assertIn("conflict", result.stdout.lower())
-        self.assertIn("file_new.txt", result.stdout)
-        
-        # Original file should still exist
-        self.assertTrue((self.test_path / "file_old.txt").exists())
-    
-    def test_duplicate_target_conflict(self):
-        """Test conflict when multiple files would have same target name"""
-        # Create files that would conflict with each other
-        (self.test_path / "file_1_test.txt").touch()
-        (self.test_path / "file_2_test.txt").touch()
-        
-        result = self.run_rnr(
-            "--find", "_test",
-            "--replace", "",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Both would become "file_1.txt" and "file_2.txt" - no conflict
-        # Let's try a real conflict
-        (self.test_path / "test_file.txt").touch()
-        (self.test_path / "test file.txt").touch()
-        
-        result = self.run_rnr(
-            "--find", " ",
-            "--replace", "_",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should detect conflict (both become "test_file.txt")
-        self.assertEqual(result.returncode, 1)
-        self.assertIn("conflict", result.stdout.lower())
-
-
-class TestCLIEdgeCases(unittest.TestCase):
-    """Integration tests for edge cases"""
-    
-    def setUp(self):
-        """Create test directory"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def run_rnr(self, *args, input_text=None):
-        """Helper to run rnr CLI command"""
-        cmd = [sys.executable, "-m", "rnr.cli"] + list(args)
-        result = subprocess.run(
-            cmd,
-            input=input_text,
-            capture_output=True,
-            text=True
-        )
-        return result
+    # Should succeed
+    assert result.returncode == 0
+    
+    # Files should be renamed
+    assert not (cli_tree / "document_old.log").exists()
+    assert (cli_tree / "document_new.log").exists()
+    
+    # Should not ask for confirmation
+    assert "Apply these changes?" not in result.stdout
+
+
+@pytest.mark.integration
+def test_recursive_rename(rnr_runner, cli_tree):
+    """Test recursive renaming through subdirectories"""
+    result = rnr_runner(
+        "--find", "_old",
+        "--replace", "_new",
+        "--path", str(cli_tree),
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    
+    # Files in root and subdir should be renamed
+    assert (cli_tree / "document_new.log").exists()
+    assert (cli_tree / "subdir" / "another_new.txt").exists()
+
+
+@pytest.mark.integration
+def test_non_recursive_rename(rnr_runner, cli_tree):
+    """Test non-recursive renaming (only current directory)"""
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(cli_tree),
+        "--no-recursive",
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
     
-    def test_empty_directory(self):
-        """Test behavior with empty directory"""
-        result = self.run_rnr(
+    # Root files should be renamed
+    assert (cli_tree / "file_1.txt").exists()
+    
+    # Subdir files should NOT be renamed
+    assert (cli_tree / "subdir" / "nested file.md").exists()
+    assert not (cli_tree / "subdir" / "nested_file.md").exists()
+
+
+@pytest.mark.integration
+def test_no_matches(rnr_runner, cli_tree):
+    """Test behavior when no files match the pattern"""
+    result = rnr_runner(
+        "--find", "nonexistent",
+        "--replace", "something",
+        "--path", str(cli_tree),
+        "--yes"
+    )
+    
+    # Should succeed with no changes
+    assert result.returncode == 0
+    
+    # Output should indicate no matches
+    assert "No files match" in result.stdout
+
+
+@pytest.mark.integration
+def test_cancel_confirmation(rnr_runner, cli_tree):
+    """Test canceling operation at confirmation prompt"""
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(cli_tree),
+        input_text="n\n"
+    )
+    
+    # Should succeed but not rename
+    assert result.returncode == 0
+    
+    # Files should not be renamed
+    assert (cli_tree / "file 1.txt").exists()
+    assert not (cli_tree / "file_1.txt").exists()
+    
+    # Output should show cancelled
+    assert "Cancelled" in result.stdout
+
+
+@pytest.mark.integration
+def test_verbose_mode(rnr_runner, cli_tree):
+    """Test verbose output mode"""
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(cli_tree),
+        "--verbose",
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    
+    # Should show individual file operations
+    assert "✓" in result.stdout
+    assert "→" in result.stdout
+
+
+@pytest.mark.integration
+def test_template_unchanged(rnr_runner, cli_tree, cli_template):
+    """Test that renaming the linked files leaves the shared tree alone"""
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(cli_tree),
+        "--yes"
+    )
+    
+    assert result.returncode == 0
+    assert (cli_tree / "file_1.txt").exists()
+    assert (cli_template / "file 1.txt").exists()
+    assert (cli_template / "subdir" / "nested file.md").exists()
+    assert not (cli_template / "file_1.txt").exists()
+
+
+@pytest.mark.integration
+def test_invalid_path(rnr_runner):
+    """Test error handling for invalid path"""
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", "/nonexistent/path/xyz"
+    )
+    
+    # Should fail
+    assert result.returncode == 1
+    
+    # Should show error message
+    assert "" in result.stderr
+
+
+@pytest.mark.integration
+def test_path_is_file(rnr_runner, cli_tree):
+    """Test error handling when the path is not a directory"""
+    file_path = cli_tree / "file 1.txt"
+    
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(file_path)
+    )
+    
+    assert result.returncode == 1
+    assert "is not a directory" in result.stdout
+    
+    # Path below a file does not exist
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(file_path / "sub")
+    )
+    
+    assert result.returncode == 1
+    assert "does not exist" in result.stdout
+
+
+@pytest.mark.integration
+def test_path_cannot_be_accessed(rnr_runner, tmp_path):
+    """Test that stat errors other than a missing path are reported, not raised"""
+    with mock.patch("rnr.cli.os.stat", side_effect=PermissionError(13, "Permission denied")):
+        result = rnr_runner(
             "--find", " ",
             "--replace", "_",
-            "--path", str(self.test_path),
-            "--yes"
+            "--path", str(tmp_path)
         )
-        
-        # Should succeed with no changes
-        self.assertEqual(result.returncode, 0)
-        self.assertIn("No files match", result.stdout)
-    
-    def test_special_characters(self):
-        """Test handling filenames with special characters"""
-        (self.test_path / "file (1).txt").touch()
-        (self.test_path / "file [copy].txt").touch()
-        
-        result = self.run_rnr(
-            "--find", " (1)",
-            "--replace", "",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        self.assertTrue((self.test_path / "file.txt").exists())
-    
-    def test_unicode_filenames(self):
-        """Test handling unicode characters in filenames"""
-        (self.test_path / "café_file.txt").touch()
-        (self.test_path / "naïve_document.txt").touch()
-        
-        result = self.run_rnr(
-            "--find", "café",
-            "--replace", "coffee",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        self.assertTrue((self.test_path / "coffee_file.txt").exists())
-    
-    def test_hidden_files(self):
-        """Test that hidden files are processed"""
-        (self.test_path / ".hidden_file").touch()
-        (self.test_path / ".config_old").touch()
-        
-        result = self.run_rnr(
-            "--find", "_old",
-            "--replace", "_new",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        self.assertTrue((self.test_path / ".config_new").exists())
-    
-    def test_extension_change(self):
-        """Test changing file extensions"""
-        (self.test_path / "document.txt").touch()
-        (self.test_path / "readme.txt").touch()
-        
-        result = self.run_rnr(
-            "--find", ".txt",
-            "--replace", ".md",
-            "--path", str(self.test_path),
-            "--yes"
-        )
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        self.assertTrue((self.test_path / "document.md").exists())
-        self.assertTrue((self.test_path / "readme.md").exists())
-        self.assertFalse((self.test_path / "document.txt").exists())
-
-
-class TestCLIArguments(unittest.TestCase):
-    """Integration tests for CLI argument handling"""
-    
-    def run_rnr(self, *args):
-        """Helper to run rnr CLI command"""
-        cmd = [sys.executable, "-m", "rnr.cli"] + list(args)
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
-        return result
     
-    def test_help_flag(self):
-        """Test --help flag"""
-        result = self.run_rnr("--help")
-        
-        # Should succeed
-        self.assertEqual(result.returncode, 0)
-        
-        # Should show help text
-        self.assertIn("usage:", result.stdout.lower())
-        self.assertIn("--find", result.stdout)
-        self.assertIn("--replace", result.stdout)
-    
-    def test_missing_required_arguments(self):
-        """Test error when required arguments are missing"""
-        result = self.run_rnr("--find", "test")
-        
-        # Should fail
-        self.assertEqual(result.returncode, 2)
-        
-        # Should show error about missing argument
-        self.assertIn("required", result.stderr.lower())
-    
-    def test_short_flags(self):
-        """Test short flag versions"""
-        test_dir = tempfile.mkdtemp()
-        test_path = Path(test_dir)
-        (test_path / "test_file.txt").touch()
-        
-        try:
-            result = self.run_rnr(
-                "-f", "test",
-                "-r", "demo",
-                "-p", str(test_path),
-                "-y"
-            )
-            
-            # Should succeed
-            self.assertEqual(result.returncode, 0)
-            self.assertTrue((test_path / "demo_file.txt").exists())
-        finally:
-            shutil.rmtree(test_dir)
+    assert result.returncode == 1
+    assert "cannot be accessed: Permission denied" in result.stdout
+    
+    # A symlink loop fails with ELOOP
+    loop = tmp_path / "loop"
+    loop.symlink_to(loop)
+    
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(loop)
+    )
+    
+    assert result.returncode == 1
+    assert "cannot be accessed" in result.stdout
+
+
+@pytest.mark.integration
+def test_remove_pattern(rnr_runner, cli_tree):
+    """Test removing a pattern from filenames"""
+    result = rnr_runner(
+        "--find", "_old",
+        "--replace", "",
+        "--path", str(cli_tree),
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    
+    # Pattern should be removed
+    assert not (cli_tree / "document_old.log").exists()
+    assert (cli_tree / "document.log").exists()
+
+
+# Integration tests for conflict detection
+def test_existing_file_conflict(rnr_runner, tmp_path):
+    """Test conflict when target file already exists"""
+    # Create files that would conflict
+    (tmp_path / "file_old.txt").touch()
+    (tmp_path / "file_new.txt").touch()  # Target already exists
+    
+    result = rnr_runner(
+        "--find", "_old",
+        "--replace", "_new",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should fail due to conflict
+    assert result.returncode == 1
+    
+    # Should report conflict
+    assert "conflict" in result.stdout.lower()
+    assert "file_new.txt" in result.stdout
+    
+    # Original file should still exist
+    assert (tmp_path / "file_old.txt").exists()
+
+
+def test_duplicate_target_conflict(rnr_runner, tmp_path):
+    """Test conflict when multiple files would have same target name"""
+    # Create files that would conflict with each other
+    (tmp_path / "file_1_test.txt").touch()
+    (tmp_path / "file_2_test.txt").touch()
+    
+    result = rnr_runner(
+        "--find", "_test",
+        "--replace", "",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Both would become "file_1.txt" and "file_2.txt" - no conflict
+    # Let's try a real conflict
+    (tmp_path / "test_file.txt").touch()
+    (tmp_path / "test file.txt").touch()
+    
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should detect conflict (both become "test_file.txt")
+    assert result.returncode == 1
+    assert "conflict" in result.stdout.lower()
+
+
+# Integration tests for edge cases
+def test_empty_directory(rnr_runner, tmp_path):
+    """Test behavior with empty directory"""
+    result = rnr_runner(
+        "--find", " ",
+        "--replace", "_",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should succeed with no changes
+    assert result.returncode == 0
+    assert "No files match" in result.stdout
+
+
+def test_special_characters(rnr_runner, tmp_path):
+    """Test handling filenames with special characters"""
+    (tmp_path / "file (1).txt").touch()
+    (tmp_path / "file [copy].txt").touch()
+    
+    result = rnr_runner(
+        "--find", " (1)",
+        "--replace", "",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    assert (tmp_path / "file.txt").exists()
+
+
+def test_unicode_filenames(rnr_runner, tmp_path):
+    """Test handling unicode characters in filenames"""
+    (tmp_path / "café_file.txt").touch()
+    (tmp_path / "naïve_document.txt").touch()
+    
+    result = rnr_runner(
+        "--find", "café",
+        "--replace", "coffee",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    assert (tmp_path / "coffee_file.txt").exists()
+
+
+def test_hidden_files(rnr_runner, tmp_path):
+    """Test that hidden files are processed"""
+    (tmp_path / ".hidden_file").touch()
+    (tmp_path / ".config_old").touch()
+    
+    result = rnr_runner(
+        "--find", "_old",
+        "--replace", "_new",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    assert (tmp_path / ".config_new").exists()
+
+
+def test_extension_change(rnr_runner, tmp_path):
+    """Test changing file extensions"""
+    (tmp_path / "document.txt").touch()
+    (tmp_path / "readme.txt").touch()
+    
+    result = rnr_runner(
+        "--find", ".txt",
+        "--replace", ".md",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    assert (tmp_path / "document.md").exists()
+    assert (tmp_path / "readme.md").exists()
+    assert not (tmp_path / "document.txt").exists()
+
+
+@pytest.mark.integration
+def test_multiple_rules(rnr_runner, tmp_path):
+    """Test several --find/--replace pairs applied in one run"""
+    (tmp_path / "my old-file.txt").touch()
+    
+    result = rnr_runner(
+        "--find", " ", "--replace", "_",
+        "--find", "-", "--replace", "_",
+        "--path", str(tmp_path),
+        "--yes"
+    )
+    
+    assert result.returncode == 0
+    assert (tmp_path / "my_old_file.txt").exists()
+
+
+@pytest.mark.integration
+def test_jobs(rnr_runner, tmp_path):
+    """Test renaming with an explicit --jobs count"""
+    (tmp_path / "document.txt").touch()
+    
+    result = rnr_runner(
+        "--find", ".txt",
+        "--replace", ".md",
+        "--path", str(tmp_path),
+        "--jobs", "1",
+        "--yes"
+    )
+    
+    assert result.returncode == 0
+    assert (tmp_path / "document.md").exists()
+    
+    result = rnr_runner(
+        "--find", ".md",
+        "--replace", ".txt",
+        "--path", str(tmp_path),
+        "--jobs", "0"
+    )
+    
+    assert result.returncode == 2
+    assert "at least 1" in result.stderr
+
+
+@pytest.mark.integration
+def test_unpaired_find(rnr_runner, tmp_path):
+    """Test error when --find and --replace counts differ"""
+    result = rnr_runner(
+        "--find", " ", "--replace", "_",
+        "--find", "-",
+        "--path", str(tmp_path)
+    )
+    
+    assert result.returncode == 2
+    assert "matching --replace" in result.stderr
+
+
+# Integration tests for CLI argument handling
+def test_help_flag(rnr_runner):
+    """Test --help flag"""
+    result = rnr_runner("--help")
+    
+    # Should succeed
+    assert result.returncode == 0
+    
+    # Should show help text
+    assert "usage:" in result.stdout.lower()
+    assert "--find" in result.stdout
+    assert "--replace" in result.stdout
+
+
+def test_missing_required_arguments(rnr_runner):
+    """Test error when required arguments are missing"""
+    result = rnr_runner("--find", "test")
+    
+    # Should fail
+    assert result.returncode == 2
+    
+    # Should show error about missing argument
+    assert "required" in result.stderr.lower()
+
+
+def test_short_flags(rnr_runner, tmp_path):
+    """Test short flag versions"""
+    (tmp_path / "test_file.txt").touch()
+    
+    result = rnr_runner(
+        "-f", "test",
+        "-r", "demo",
+        "-p", str(tmp_path),
+        "-y"
+    )
+    
+    # Should succeed
+    assert result.returncode == 0
+    assert (tmp_path / "demo_file.txt").exists()
+
+
+# Smoke test that runs rnr as a real subprocess
+@pytest.mark.integration
+def test_module_entry_point(tmp_path):
+    """Test that python -m rnr.cli is wired up to main"""
+    (tmp_path / "test_file.txt").touch()
+    
+    result = run_rnr(
+        "--find", "test", "--replace", "demo",
+        "--path", str(tmp_path), "--yes", "--verbose"
+    )
+    
+    assert result.returncode == 0
+    assert result.stderr == ""
+    assert "Successfully renamed: 1" in result.stdout
+    assert "test_file.txt → demo_file.txt" in result.stdout
+    assert (tmp_path / "demo_file.txt").exists()
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
\ No newline at end of file
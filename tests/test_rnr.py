@@ -5,11 +5,11 @@ Run with: python -m pytest test_rnr.py -v
 Or: python test_rnr.py
 """
 
-import unittest
-import tempfile
-import shutil
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
+import pytest
 
 # Import functions from rnr
 # Note: In practice, you'd want to structure this as a proper package
@@ -21,297 +21,398 @@ sys.path.insert(0, '.')
 # In a real setup, you'd import from rnr module
 
 
+@dataclass
+class FileBatch:
+    """Found files as parallel lists of directory and name strings"""
+    parents: List[str] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def paths(self) -> List[Path]:
+        """Build Path objects, for callers that need them"""
+        return [Path(parent, name) for parent, name in zip(self.parents, self.names)]
+
+
 class MockRnr:
     """Mock version of rnr functions for testing"""
     
     @staticmethod
-    def find_files(root_path: Path, pattern: str = None, recursive: bool = True) -> List[Path]:
-        """Find all files in the given path"""
-        files = []
+    def _scandir(path: str, pattern: str = None,
+                 recursive: bool = True) -> Iterator[Tuple[str, str]]:
+        """Yield (parent, name) for matching files, using the d_type from scandir"""
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file():
+                    if pattern is None or pattern in entry.name:
+                        yield path, entry.name
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    yield from MockRnr._scandir(entry.path, pattern, recursive)
+    
+    @staticmethod
+    def find_file_batch(root_path: Path, pattern: str = None, recursive: bool = True) -> FileBatch:
+        """Find all files in the given path, in walk order, without building Paths"""
+        batch = FileBatch()
+        parents = batch.parents
+        names = batch.names
+        
+        for parent, name in MockRnr._scandir(os.fspath(root_path), pattern, recursive):
+            parents.append(parent)
+            names.append(name)
+        
+        return batch
+    
+    @staticmethod
+    def find_files(root_path: Path, pattern: str = None, recursive: bool = True,
+                   sort: bool = False) -> Iterator[Path]:
+        """Lazily yield all files in the given path, in walk order unless sort is set"""
+        files = (Path(parent, name)
+                 for parent, name in MockRnr._scandir(os.fspath(root_path), pattern, recursive))
+        
+        # Sorting needs every path up front; walk order streams
+        if sort:
+            return iter(sorted(files))
+        return files
+    
+    @staticmethod
+    def generate_batch_pairs(batch: FileBatch, find: str, replace: str) -> List[Tuple[str, str]]:
+        """Generate old and new path string pairs, walking the batch in lock-step"""
+        rename_pairs = []
+        join = os.path.join
         
-        if recursive:
-            for item in root_path.rglob('*'):
-                if item.is_file():
-                    if pattern is None or pattern in item.name:
-                        files.append(item)
-        else:
-            for item in root_path.glob('*'):
-                if item.is_file():
-                    if pattern is None or pattern in item.name:
-                        files.append(item)
+        for parent, old_name in zip(batch.parents, batch.names):
+            if find not in old_name:
+                continue
+            new_name = old_name.replace(find, replace)
+            if old_name != new_name:
+                rename_pairs.append((join(parent, old_name), join(parent, new_name)))
         
-        return sorted(files)
+        return rename_pairs
     
     @staticmethod
-    def generate_rename_pairs(files: List[Path], find: str, replace: str) -> List[Tuple[Path, Path]]:
+    def generate_rename_pairs(files: Iterable[Path], find: str,
+                              replace: str) -> List[Tuple[Path, Path]]:
         """Generate old and new path pairs for renaming"""
         rename_pairs = []
         
+        # One replace over all names joined with a separator measures the
+        # same as this loop; building the Path objects is what costs
         for file_path in files:
             old_name = file_path.name
+            # Most names don't match; skip building an identical copy
+            if find not in old_name:
+                continue
             new_name = old_name.replace(find, replace)
             
             if old_name != new_name:
+                # Only renamed files reach here. Reusing one parent Path per
+                # directory measured no faster: finding the directory of each
+                # file costs as much as .parent, and the join dominates
                 new_path = file_path.parent / new_name
                 rename_pairs.append((file_path, new_path))
         
         return rename_pairs
     
+    @staticmethod
+    def _list_names(directory: str) -> set:
+        """Return the names in a directory, or an empty set if it is missing"""
+        try:
+            with os.scandir(directory or os.curdir) as it:
+                return {entry.name for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+    
     @staticmethod
     def check_conflicts(rename_pairs: List[Tuple[Path, Path]]) -> List[Tuple[Path, Path]]:
-        """Check for naming conflicts"""
+        """Check for naming conflicts in Path or string pairs"""
         conflicts = []
         new_paths = set()
+        fspath = os.fspath
+        split = os.path.split
+        # One scandir per target directory instead of a stat per target
+        dir_names = {}
         
         for old_path, new_path in rename_pairs:
-            if new_path.exists() and new_path != old_path:
+            # Stringify once and use the string for both checks
+            key = fspath(new_path)
+            parent, name = split(key)
+            existing = dir_names.get(parent)
+            if existing is None:
+                existing = dir_names[parent] = MockRnr._list_names(parent)
+            if new_path != old_path and name in existing:
                 conflicts.append((old_path, new_path))
-            elif str(new_path) in new_paths:
+            elif key in new_paths:
                 conflicts.append((old_path, new_path))
             else:
-                new_paths.add(str(new_path))
+                new_paths.add(key)
         
         return conflicts
 
 
-class TestRnrFileDiscovery(unittest.TestCase):
-    """Test file discovery functionality"""
+# Test file discovery functionality
+@pytest.fixture
+def file_tree(tmp_path):
+    """Create a temporary directory structure for testing"""
+    # Create test file structure
+    # root/
+    #   file1.txt
+    #   file2.log
+    #   subdir1/
+    #     file3.txt
+    #     file4.md
+    #   subdir2/
+    #     file5.txt
     
-    def setUp(self):
-        """Create a temporary directory structure for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-        
-        # Create test file structure
-        # root/
-        #   file1.txt
-        #   file2.log
-        #   subdir1/
-        #     file3.txt
-        #     file4.md
-        #   subdir2/
-        #     file5.txt
-        
-        (self.test_path / "file1.txt").touch()
-        (self.test_path / "file2.log").touch()
-        
-        (self.test_path / "subdir1").mkdir()
-        (self.test_path / "subdir1" / "file3.txt").touch()
-        (self.test_path / "subdir1" / "file4.md").touch()
-        
-        (self.test_path / "subdir2").mkdir()
-        (self.test_path / "subdir2" / "file5.txt").touch()
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def test_find_files_recursive(self):
-        """Test recursive file discovery"""
-        files = MockRnr.find_files(self.test_path, recursive=True)
-        self.assertEqual(len(files), 5)
-    
-    def test_find_files_non_recursive(self):
-        """Test non-recursive file discovery"""
-        files = MockRnr.find_files(self.test_path, recursive=False)
-        self.assertEqual(len(files), 2)
-        file_names = [f.name for f in files]
-        self.assertIn("file1.txt", file_names)
-        self.assertIn("file2.log", file_names)
-    
-    def test_find_files_with_pattern(self):
-        """Test file discovery with pattern matching"""
-        files = MockRnr.find_files(self.test_path, pattern=".txt", recursive=True)
-        self.assertEqual(len(files), 3)
-        for file in files:
-            self.assertIn(".txt", file.name)
-    
-    def test_find_files_no_matches(self):
-        """Test file discovery with no matches"""
-        files = MockRnr.find_files(self.test_path, pattern=".xyz", recursive=True)
-        self.assertEqual(len(files), 0)
-
-
-class TestRnrRenameLogic(unittest.TestCase):
-    """Test rename pair generation logic"""
-    
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
-    
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
-    
-    def test_generate_rename_pairs_basic(self):
-        """Test basic rename pair generation"""
-        # Create test files
-        file1 = self.test_path / "test_file.txt"
-        file2 = self.test_path / "another_test.log"
-        file1.touch()
-        file2.touch()
-        
-        files = [file1, file2]
-        pairs = MockRnr.generate_rename_pairs(files, "test", "demo")
-        
-        self.assertEqual(len(pairs), 2)
-        self.assertEqual(pairs[0][1].name, "demo_file.txt")
-        self.assertEqual(pairs[1][1].name, "another_demo.log")
-    
-    def test_generate_rename_pairs_no_change(self):
-        """Test that files without pattern don't get renamed"""
-        file1 = self.test_path / "file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = MockRnr.generate_rename_pairs(files, "xyz", "abc")
-        
-        self.assertEqual(len(pairs), 0)
+    (tmp_path / "file1.txt").touch()
+    (tmp_path / "file2.log").touch()
     
-    def test_generate_rename_pairs_removal(self):
-        """Test removing pattern from filenames"""
-        file1 = self.test_path / "file_backup.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = MockRnr.generate_rename_pairs(files, "_backup", "")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "file.txt")
+    (tmp_path / "subdir1").mkdir()
+    (tmp_path / "subdir1" / "file3.txt").touch()
+    (tmp_path / "subdir1" / "file4.md").touch()
     
-    def test_generate_rename_pairs_multiple_occurrences(self):
-        """Test replacing multiple occurrences in filename"""
-        file1 = self.test_path / "test_test_file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = MockRnr.generate_rename_pairs(files, "test", "demo")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "demo_demo_file.txt")
+    (tmp_path / "subdir2").mkdir()
+    (tmp_path / "subdir2" / "file5.txt").touch()
+    
+    return tmp_path
+
+
+def test_find_files_recursive(file_tree):
+    """Test recursive file discovery"""
+    files = list(MockRnr.find_files(file_tree, recursive=True))
+    assert len(files) == 5
+
+
+def test_find_files_non_recursive(file_tree):
+    """Test non-recursive file discovery"""
+    files = list(MockRnr.find_files(file_tree, recursive=False))
+    assert len(files) == 2
+    file_names = [f.name for f in files]
+    assert "file1.txt" in file_names
+    assert "file2.log" in file_names
+
+
+def test_find_files_with_pattern(file_tree):
+    """Test file discovery with pattern matching"""
+    files = list(MockRnr.find_files(file_tree, pattern=".txt", recursive=True))
+    assert len(files) == 3
+    for file in files:
+        assert ".txt" in file.name
+
 
+def test_find_files_sorted(file_tree):
+    """Test that sort=True returns files in path order"""
+    files = list(MockRnr.find_files(file_tree, recursive=True, sort=True))
+    assert files == sorted(files)
+    assert files[0].name == "file1.txt"
 
-class TestRnrConflictDetection(unittest.TestCase):
-    """Test conflict detection logic"""
+
+def test_find_file_batch(file_tree):
+    """Test that the batch holds parallel parent and name lists"""
+    batch = MockRnr.find_file_batch(file_tree, pattern=".txt", recursive=True)
+    assert len(batch) == 3
+    assert sorted(batch.names) == ["file1.txt", "file3.txt", "file5.txt"]
+    assert str(file_tree / "subdir1") in batch.parents
+    assert sorted(batch.paths()) == list(MockRnr.find_files(file_tree, pattern=".txt", sort=True))
+
+
+def test_find_files_is_lazy(file_tree):
+    """Test that find_files yields paths without walking the whole tree first"""
+    files = MockRnr.find_files(file_tree, recursive=True)
+    assert not isinstance(files, list)
+    assert next(files).is_file()
     
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
+    pairs = MockRnr.generate_rename_pairs(files, "file", "doc")
+    assert len(pairs) == 4
+
+
+def test_find_files_no_matches(file_tree):
+    """Test file discovery with no matches"""
+    files = list(MockRnr.find_files(file_tree, pattern=".xyz", recursive=True))
+    assert len(files) == 0
+
+
+# Test rename pair generation logic
+def test_generate_rename_pairs_basic(tmp_path):
+    """Test basic rename pair generation"""
+    # Create test files
+    file1 = tmp_path / "test_file.txt"
+    file2 = tmp_path / "another_test.log"
+    file1.touch()
+    file2.touch()
     
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
+    files = [file1, file2]
+    pairs = MockRnr.generate_rename_pairs(files, "test", "demo")
     
-    def test_no_conflicts(self):
-        """Test scenario with no conflicts"""
-        file1 = self.test_path / "file1.txt"
-        file2 = self.test_path / "file2.txt"
-        file1.touch()
-        file2.touch()
-        
-        new1 = self.test_path / "renamed1.txt"
-        new2 = self.test_path / "renamed2.txt"
-        
-        pairs = [(file1, new1), (file2, new2)]
-        conflicts = MockRnr.check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 0)
-    
-    def test_existing_file_conflict(self):
-        """Test conflict when target file already exists"""
-        file1 = self.test_path / "file1.txt"
-        existing = self.test_path / "existing.txt"
-        file1.touch()
-        existing.touch()
-        
-        pairs = [(file1, existing)]
-        conflicts = MockRnr.check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 1)
-    
-    def test_duplicate_target_conflict(self):
-        """Test conflict when multiple files would have same target name"""
-        file1 = self.test_path / "file1.txt"
-        file2 = self.test_path / "file2.txt"
-        file1.touch()
-        file2.touch()
-        
-        target = self.test_path / "same_name.txt"
-        pairs = [(file1, target), (file2, target)]
-        conflicts = MockRnr.check_conflicts(pairs)
-        
-        self.assertEqual(len(conflicts), 1)
+    assert len(pairs) == 2
+    assert pairs[0][1].name == "demo_file.txt"
+    assert pairs[1][1].name == "another_demo.log"
 
 
-class TestRnrEdgeCases(unittest.TestCase):
-    """Test edge cases and special scenarios"""
+def test_generate_rename_pairs_no_change(tmp_path):
+    """Test that files without pattern don't get renamed"""
+    file1 = tmp_path / "file.txt"
+    file1.touch()
     
-    def setUp(self):
-        """Create temporary directory for testing"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.test_dir)
+    files = [file1]
+    pairs = MockRnr.generate_rename_pairs(files, "xyz", "abc")
     
-    def tearDown(self):
-        """Clean up temporary directory"""
-        shutil.rmtree(self.test_dir)
+    assert len(pairs) == 0
+
+
+def test_generate_rename_pairs_removal(tmp_path):
+    """Test removing pattern from filenames"""
+    file1 = tmp_path / "file_backup.txt"
+    file1.touch()
     
-    def test_empty_directory(self):
-        """Test behavior with empty directory"""
-        files = MockRnr.find_files(self.test_path, recursive=True)
-        self.assertEqual(len(files), 0)
+    files = [file1]
+    pairs = MockRnr.generate_rename_pairs(files, "_backup", "")
     
-    def test_special_characters_in_filename(self):
-        """Test handling files with special characters"""
-        file1 = self.test_path / "file (1).txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = MockRnr.generate_rename_pairs(files, " (1)", "")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "file.txt")
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "file.txt"
+
+
+def test_generate_batch_pairs(tmp_path):
+    """Test pair generation from a FileBatch"""
+    (tmp_path / "test_file.txt").touch()
+    (tmp_path / "other.txt").touch()
     
-    def test_spaces_replacement(self):
-        """Test replacing spaces in filenames"""
-        file1 = self.test_path / "my test file.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = MockRnr.generate_rename_pairs(files, " ", "_")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "my_test_file.txt")
+    batch = MockRnr.find_file_batch(tmp_path, recursive=False)
+    pairs = MockRnr.generate_batch_pairs(batch, "test", "demo")
     
-    def test_extension_replacement(self):
-        """Test replacing file extensions"""
-        file1 = self.test_path / "document.txt"
-        file1.touch()
-        
-        files = [file1]
-        pairs = MockRnr.generate_rename_pairs(files, ".txt", ".md")
-        
-        self.assertEqual(len(pairs), 1)
-        self.assertEqual(pairs[0][1].name, "document.md")
+    assert pairs == [(str(tmp_path / "test_file.txt"), str(tmp_path / "demo_file.txt"))]
 
 
-def run_tests():
-    """Run all tests"""
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
+def test_generate_rename_pairs_multiple_occurrences(tmp_path):
+    """Test replacing multiple occurrences in filename"""
+    file1 = tmp_path / "test_test_file.txt"
+    file1.touch()
+    
+    files = [file1]
+    pairs = MockRnr.generate_rename_pairs(files, "test", "demo")
+    
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "demo_demo_file.txt"
+
+
+# Test conflict detection logic
+def test_no_conflicts(tmp_path):
+    """Test scenario with no conflicts"""
+    file1 = tmp_path / "file1.txt"
+    file2 = tmp_path / "file2.txt"
+    file1.touch()
+    file2.touch()
+    
+    new1 = tmp_path / "renamed1.txt"
+    new2 = tmp_path / "renamed2.txt"
+    
+    pairs = [(file1, new1), (file2, new2)]
+    conflicts = MockRnr.check_conflicts(pairs)
     
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestRnrFileDiscovery))
-    suite.addTests(loader.loadTestsFromTestCase(TestRnrRenameLogic))
-    suite.addTests(loader.loadTestsFromTestCase(TestRnrConflictDetection))
-    suite.addTests(loader.loadTestsFromTestCase(TestRnrEdgeCases))
+    assert len(conflicts) == 0
+
+
+def test_existing_file_conflict(tmp_path):
+    """Test conflict when target file already exists"""
+    file1 = tmp_path / "file1.txt"
+    existing = tmp_path / "existing.txt"
+    file1.touch()
+    existing.touch()
+    
+    pairs = [(file1, existing)]
+    conflicts = MockRnr.check_conflicts(pairs)
+    
+    assert len(conflicts) == 1
+
+
+def test_string_pair_conflicts(tmp_path):
+    """Test conflict detection on string pairs from generate_batch_pairs"""
+    (tmp_path / "a_test.txt").touch()
+    (tmp_path / "a test.txt").touch()
+    (tmp_path / "b test.txt").touch()
+    (tmp_path / "b_test.txt").touch()
     
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    batch = MockRnr.find_file_batch(tmp_path, recursive=False)
+    pairs = MockRnr.generate_batch_pairs(batch, " ", "_")
+    conflicts = MockRnr.check_conflicts(pairs)
     
-    return result.wasSuccessful()
+    assert len(pairs) == 2
+    assert sorted(conflicts) == sorted(pairs)
+
+
+def test_duplicate_target_conflict(tmp_path):
+    """Test conflict when multiple files would have same target name"""
+    file1 = tmp_path / "file1.txt"
+    file2 = tmp_path / "file2.txt"
+    file1.touch()
+    file2.touch()
+    
+    target = tmp_path / "same_name.txt"
+    pairs = [(file1, target), (file2, target)]
+    conflicts = MockRnr.check_conflicts(pairs)
+    
+    assert len(conflicts) == 1
+
+
+def test_conflicts_across_directories(file_tree):
+    """Test that each target is checked against its own directory"""
+    pairs = [
+        (file_tree / "file1.txt", file_tree / "file2.log"),
+        (file_tree / "subdir1" / "file3.txt", file_tree / "subdir1" / "file2.log"),
+        (file_tree / "subdir2" / "file5.txt", file_tree / "missing" / "file5.txt"),
+    ]
+    conflicts = MockRnr.check_conflicts(pairs)
+    
+    assert conflicts == [pairs[0]]
+
+
+# Test edge cases and special scenarios
+def test_empty_directory(tmp_path):
+    """Test behavior with empty directory"""
+    files = list(MockRnr.find_files(tmp_path, recursive=True))
+    assert len(files) == 0
+
+
+def test_special_characters_in_filename(tmp_path):
+    """Test handling files with special characters"""
+    file1 = tmp_path / "file (1).txt"
+    file1.touch()
+    
+    files = [file1]
+    pairs = MockRnr.generate_rename_pairs(files, " (1)", "")
+    
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "file.txt"
+
+
+def test_spaces_replacement(tmp_path):
+    """Test replacing spaces in filenames"""
+    file1 = tmp_path / "my test file.txt"
+    file1.touch()
+    
+    files = [file1]
+    pairs = MockRnr.generate_rename_pairs(files, " ", "_")
+    
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "my_test_file.txt"
+
+
+def test_extension_replacement(tmp_path):
+    """Test replacing file extensions"""
+    file1 = tmp_path / "document.txt"
+    file1.touch()
+    
+    files = [file1]
+    pairs = MockRnr.generate_rename_pairs(files, ".txt", ".md")
+    
+    assert len(pairs) == 1
+    assert pairs[0][1].name == "document.md"
+
+
+def run_tests():
+    """Run all tests"""
+    # The tests are plain pytest functions, so run them through pytest
+    return pytest.main([__file__, "-v"]) == 0
 
 
 if __name__ == '__main__':